@@ -0,0 +1,215 @@
+"""Shared performance instrumentation for the PyInMotion apps.
+
+Every app wraps its hot paths with `timed` (a decorator) or `span` (a
+context manager) and bumps `count`ers. Nothing is measured unless the
+PYMOTION_PROFILE environment variable is set when the app starts. The apps
+import this module through their project's _profiling.py, so the repository
+root has to be on PYTHONPATH:
+
+    PYTHONPATH=.. PYMOTION_PROFILE=1 python TextReverser.py big.txt > /dev/null
+    PYTHONPATH=.. PYMOTION_PROFILE=reports/run1 python ExpenseTracker.py
+
+When the program exits, a report is written: "1" uses
+pymotion-profile-<program>-<pid> in the working directory, and any other
+value is used as the path prefix. <prefix>.json holds per-span call
+counts and timings plus the counters; <prefix>.folded holds self time per
+stack of spans, in microseconds, in the collapsed-stack format that
+flamegraph.pl and speedscope read. Set PYMOTION_PROFILE_MEMORY=1 as well to
+sample memory with tracemalloc (slower).
+
+When profiling is off, `timed` returns the function unchanged and `span`
+returns a shared do-nothing context manager, so the instrumentation costs
+next to nothing.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import threading
+
+ENV_VAR = "PYMOTION_PROFILE"
+MEMORY_ENV_VAR = "PYMOTION_PROFILE_MEMORY"
+
+# Allocation sites listed in the report when memory sampling is on
+TOP_ALLOCATIONS = 10
+
+enabled = bool(os.environ.get(ENV_VAR))
+memory_enabled = enabled and os.environ.get(MEMORY_ENV_VAR, "") not in ("", "0")
+
+_lock = threading.Lock()
+_local = threading.local()
+_spans = {}      # name -> [calls, total_ns, min_ns, max_ns, memory_delta_bytes]
+_stacks = {}     # "thread;outer;inner" -> self time in ns
+_counters = {}
+_start_ns = time.perf_counter_ns()
+
+
+class _NullSpan:
+    """Context manager returned by `span` while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """A timed region; spans opened inside it on the same thread become its children."""
+
+    __slots__ = ("name", "start", "child_ns", "memory")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = [threading.current_thread().name]
+        stack.append(self)
+        self.child_ns = 0
+        self.memory = tracemalloc.get_traced_memory()[0] if memory_enabled else 0
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter_ns() - self.start
+        memory_delta = tracemalloc.get_traced_memory()[0] - self.memory if memory_enabled else 0
+        stack = _local.stack
+        stack.pop()
+        key = ";".join(frame if isinstance(frame, str) else frame.name for frame in stack)
+        key = f"{key};{self.name}"
+        if len(stack) > 1:
+            stack[-1].child_ns += elapsed
+        with _lock:
+            stats = _spans.get(self.name)
+            if stats is None:
+                _spans[self.name] = [1, elapsed, elapsed, elapsed, memory_delta]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                if elapsed < stats[2]:
+                    stats[2] = elapsed
+                if elapsed > stats[3]:
+                    stats[3] = elapsed
+                stats[4] += memory_delta
+            _stacks[key] = _stacks.get(key, 0) + elapsed - self.child_ns
+        return False
+
+
+def span(name):
+    """Context manager timing the enclosed block under `name`."""
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name=None):
+    """Decorator timing every call of a function (named after its qualified name by default)."""
+    def decorate(function):
+        if not enabled:
+            return function
+        label = name or function.__qualname__
+
+        # functools.wraps also copies __module__, so wrapped functions still pickle
+        # (e.g. as multiprocessing tasks)
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _Span(label):
+                return function(*args, **kwargs)
+
+        return wrapper
+    return decorate
+
+
+def count(name, amount=1):
+    """Add `amount` to the counter `name`."""
+    if enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + amount
+
+
+def report():
+    """The profile gathered so far, as a JSON-serialisable dictionary."""
+    with _lock:
+        spans = {
+            name: {
+                "calls": calls,
+                "total_s": total / 1e9,
+                "mean_s": total / calls / 1e9,
+                "min_s": low / 1e9,
+                "max_s": high / 1e9,
+                **({"memory_delta_bytes": memory} if memory_enabled else {}),
+            }
+            for name, (calls, total, low, high, memory) in sorted(_spans.items(), key=lambda item: -item[1][1])
+        }
+        result = {
+            "program": os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python",
+            "pid": os.getpid(),
+            "wall_time_s": (time.perf_counter_ns() - _start_ns) / 1e9,
+            "spans": spans,
+            "counters": dict(_counters),
+        }
+    if memory_enabled and tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        statistics = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+        result["memory"] = {
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "top_allocations": [{"location": str(stat.traceback), "bytes": stat.size, "blocks": stat.count}
+                                for stat in statistics],
+        }
+    return result
+
+
+def collapsed_stacks():
+    """Self time per stack of spans as collapsed-stack lines ("a;b;c microseconds")."""
+    with _lock:
+        return [f"{stack} {max(1, nanoseconds // 1000)}" for stack, nanoseconds in sorted(_stacks.items())]
+
+
+def dump(prefix=None):
+    """Write <prefix>.json and <prefix>.folded; returns the two paths."""
+    if prefix is None:
+        setting = os.environ.get(ENV_VAR, "1")
+        if setting == "1":
+            program = os.path.splitext(os.path.basename(sys.argv[0] if sys.argv and sys.argv[0] else "python"))[0]
+            prefix = f"pymotion-profile-{program}-{os.getpid()}"
+        else:
+            prefix = setting
+    directory = os.path.dirname(prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    json_path, folded_path = f"{prefix}.json", f"{prefix}.folded"
+    with open(json_path, "w", encoding="utf-8") as file:
+        json.dump(report(), file, indent=4)
+    with open(folded_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(collapsed_stacks()) + "\n")
+    return json_path, folded_path
+
+
+def _dump_at_exit():
+    # Only the main process reports; worker processes (forked or spawned) exit silently
+    multiprocessing = sys.modules.get("multiprocessing")
+    if os.getpid() != _owner_pid or (multiprocessing is not None and multiprocessing.parent_process() is not None):
+        return
+    try:
+        json_path, _ = dump()
+        print(f"Profile written to {json_path}", file=sys.stderr)
+    except OSError as e:
+        print(f"Could not write profile: {e}", file=sys.stderr)
+
+
+_owner_pid = os.getpid()
+if enabled:
+    if memory_enabled:
+        import tracemalloc
+        tracemalloc.start()
+    atexit.register(_dump_at_exit)
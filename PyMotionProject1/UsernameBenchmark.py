@@ -0,0 +1,44 @@
+import time
+import argparse
+
+from UsernameGen import UsernameGenerator, make_rng, RNG_MODES
+
+
+def benchmark_mode(mode, count, length, seed=0):
+    """Generate `count` usernames in each generation style and return usernames per second."""
+    generator = UsernameGenerator(rng=make_rng(mode, seed))
+    results = {}
+
+    start = time.perf_counter()
+    for _ in range(count):
+        generator.generate_random_username(length, True, True)
+    elapsed = time.perf_counter() - start
+    results["random"] = count / elapsed if elapsed else float("inf")
+
+    start = time.perf_counter()
+    for _ in range(count):
+        generator.generate_word_username(True, True)
+    elapsed = time.perf_counter() - start
+    results["words"] = count / elapsed if elapsed else float("inf")
+
+    return results
+
+
+def main():
+    """Run the RNG throughput benchmark and print a small table."""
+    parser = argparse.ArgumentParser(description="Benchmark username generation for each RNG mode.")
+    parser.add_argument("--count", type=int, default=200000, help="usernames generated per measurement")
+    parser.add_argument("--length", type=int, default=12, help="length of random-character usernames")
+    parser.add_argument("--seed", type=int, default=0, help="seed used by the seeded mode")
+    args = parser.parse_args()
+
+    print(f"Generating {args.count} usernames per mode (length {args.length})")
+    print(f"{'Mode':<10} | {'Random (names/s)':>16} | {'Words (names/s)':>16}")
+    print("-" * 48)
+    for mode in RNG_MODES:
+        results = benchmark_mode(mode, args.count, args.length, args.seed)
+        print(f"{mode:<10} | {results['random']:>16,.0f} | {results['words']:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
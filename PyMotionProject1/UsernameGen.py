@@ -1,12 +1,668 @@
 import random
 import string
 import os
+import sys
 import json
+import hashlib
+import secrets
+import argparse
+import struct
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 
+# multiprocessing, tempfile, shutil, csv, io and gzip are imported inside the
+# functions that need them: together they make up most of the import time,
+# and most runs never touch them.
+
+from _profiling import timed, profile_count
+
+
+class SecureRandomSource:
+    """Cryptographically secure random source backed by `secrets`.
+
+    Entropy is pulled from the OS in large blocks and consumed from a local
+    buffer, so generating many short usernames does not cost one system call
+    per character. Selection uses rejection sampling, so every element of a
+    population is exactly equally likely.
+    """
+
+    def __init__(self, buffer_size=65536):
+        self.buffer_size = buffer_size
+        self._buffer = b""
+        self._pos = 0
+
+    def _take(self, count):
+        """Return the next `count` random bytes, refilling the buffer as needed."""
+        if self._pos + count > len(self._buffer):
+            refill = secrets.token_bytes(max(self.buffer_size, count))
+            self._buffer = self._buffer[self._pos:] + refill
+            self._pos = 0
+        start = self._pos
+        self._pos += count
+        return self._buffer[start:self._pos]
+
+    def randbelow(self, n):
+        """Return a uniformly distributed integer in the range [0, n)."""
+        if n <= 0:
+            raise ValueError("n must be positive")
+        bits = (n - 1).bit_length()
+        num_bytes = max(1, (bits + 7) // 8)
+        mask = (1 << bits) - 1
+        while True:
+            value = int.from_bytes(self._take(num_bytes), "big") & mask
+            if value < n:
+                return value
+
+    def randint(self, a, b):
+        """Return a random integer N such that a <= N <= b."""
+        return a + self.randbelow(b - a + 1)
+
+    def choice(self, seq):
+        """Return a random element from a non-empty sequence."""
+        return seq[self.randbelow(len(seq))]
+
+    def choices(self, population, k=1):
+        """Return a list of `k` elements chosen with replacement."""
+        n = len(population)
+        if n > 256:
+            return [population[self.randbelow(n)] for _ in range(k)]
+        # Bytes at or above `limit` would bias the modulo, so they are dropped.
+        limit = 256 - 256 % n
+        picked = []
+        while len(picked) < k:
+            chunk = self._take(k - len(picked))
+            picked.extend(population[b % n] for b in chunk if b < limit)
+        return picked
+
+
+class SeededRandomSource(random.Random):
+    """Deterministic random source for reproducible fixtures.
+
+    A seeded source can be split into independent child streams, one per
+    parallel worker. Child seeds are derived by hashing the parent seed with
+    the stream index, so stream `i` always yields the same sequence no matter
+    how many other streams exist or in which order they are used.
+    """
+
+    def __init__(self, seed=0):
+        self.seed_value = seed
+        super().__init__(seed)
+
+    def spawn(self, index):
+        """Return the independent child stream with the given index."""
+        digest = hashlib.sha256(f"{self.seed_value}:{index}".encode("utf-8")).digest()
+        return SeededRandomSource(int.from_bytes(digest[:16], "big"))
+
+    def split(self, count):
+        """Return `count` independent child streams."""
+        return [self.spawn(i) for i in range(count)]
+
+
+PACKED_MAGIC = b"PYWLIST1"
+PACKED_HEADER = struct.Struct("<8sQ")
+
+
+class PackedWordList:
+    """Read-only, sorted and deduplicated word list stored in a packed file.
+
+    The file holds a header, a table of uint32 offsets and one UTF-8 blob of
+    all words. It is memory-mapped on first access, so opening a list of any
+    size is instant, and `words[i]` decodes a single word in O(1) without
+    turning the rest of the list into Python objects. It behaves like a
+    sequence, which is all `choice` needs. Slicing returns a view sharing the
+    same file, used to hand each parallel worker its own range.
+
+    The header is checked when the list is created: a file that is not a
+    packed word list, or holds no words, raises ValueError. `close()` (or
+    using the list as a context manager) releases the mapping; the file is
+    mapped again if the list is used afterwards.
+    """
+
+    def __init__(self, path, start=0, stop=None):
+        self.path = path
+        self._start = start
+        self._map = None
+        with open(path, "rb") as file:
+            header = file.read(PACKED_HEADER.size)
+        if len(header) < PACKED_HEADER.size or not header.startswith(PACKED_MAGIC):
+            raise ValueError(f"{path} is not a packed word list")
+        count = PACKED_HEADER.unpack(header)[1]
+        if not count:
+            raise ValueError(f"{path}: word list is empty")
+        self._count = count
+        self._blob_start = PACKED_HEADER.size + 4 * (count + 1)
+        self._stop = count if stop is None or stop > count else stop
+
+    def _open(self):
+        """Map the file."""
+        import mmap
+
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        """Unmap the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Packed word lists only support contiguous slices")
+            return PackedWordList(self.path, self._start + start, self._start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("word list index out of range")
+        if self._map is None:
+            self._open()
+        begin, end = struct.unpack_from("<II", self._map, PACKED_HEADER.size + 4 * (self._start + index))
+        return self._map[self._blob_start + begin:self._blob_start + end].decode("utf-8")
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __reduce__(self):
+        # Workers reopen the file themselves instead of receiving its contents
+        return PackedWordList, (self.path, self._start, self._stop)
+
+
+def build_packed_wordlist(words, path):
+    """Deduplicate, sort and pack an iterable of words into `path`.
+
+    Blank entries and lines starting with '#' are skipped. Returns the number
+    of unique words written.
+    """
+    unique = sorted({word.strip() for word in words
+                     if word.strip() and not word.lstrip().startswith("#")})
+    encoded = [word.encode("utf-8") for word in unique]
+    if sum(len(word) for word in encoded) >= 2 ** 32:
+        raise ValueError("Word list is too large to pack (over 4 GB of text)")
+
+    import array
+
+    offsets = array.array("I", [0])
+    position = 0
+    for word in encoded:
+        position += len(word)
+        offsets.append(position)
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    with open(path, "wb") as file:
+        file.write(PACKED_HEADER.pack(PACKED_MAGIC, len(encoded)))
+        file.write(offsets.tobytes())
+        file.write(b"".join(encoded))
+    return len(encoded)
+
+
+@timed()
+def load_wordlist(path):
+    """Open a word list file as a `PackedWordList`.
+
+    Packed files are used as they are. A plain text file (one word per line) is
+    packed once into `<path>.pwl` next to it, and that copy is reused until the
+    text file changes.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(PACKED_MAGIC)) == PACKED_MAGIC:
+            return PackedWordList(path)
+
+    packed_path = path + ".pwl"
+    if not os.path.exists(packed_path) or os.path.getmtime(packed_path) < os.path.getmtime(path):
+        with open(path, "r", encoding="utf-8") as file:
+            build_packed_wordlist(file, packed_path)
+    return PackedWordList(packed_path)
+
+
+RNG_MODES = ("default", "secure", "seeded")
+
+
+def make_rng(mode="default", seed=None):
+    """Create a random source for the given mode ('default', 'secure' or 'seeded')."""
+    if mode == "default":
+        return random
+    if mode == "secure":
+        return SecureRandomSource()
+    if mode == "seeded":
+        return SeededRandomSource(0 if seed is None else seed)
+    raise ValueError(f"Unknown RNG mode '{mode}'. Choose one of: {', '.join(RNG_MODES)}")
+
+
+AMBIGUOUS_CHARS = "0O1lI|"
+TEMPLATE_CLASSES = {
+    "d": string.digits,
+    "l": string.ascii_letters,
+    "u": string.ascii_uppercase,
+    "a": string.ascii_lowercase,
+    "c": string.ascii_letters + string.digits,
+}
+TEMPLATE_ESCAPES = {"d": string.digits, "w": string.ascii_letters + string.digits + "_"}
+
+
+class CompiledTemplate:
+    """A username template compiled into a single generator closure.
+
+    Calling the object (or `generate()`) returns one username. `keyspace` is the
+    exact number of distinct choice combinations the template can make; it
+    equals the number of distinct usernames whenever the parts cannot run into
+    each other (fixed-width parts, or word lists where no word prefixes
+    another).
+    """
+
+    def __init__(self, template, generate, keyspace):
+        self.template = template
+        self.generate = generate
+        self.keyspace = keyspace
+
+    def __call__(self):
+        return self.generate()
+
+    def __repr__(self):
+        return f"CompiledTemplate({self.template!r}, keyspace={self.keyspace})"
+
+
+def _parse_char_class(template, i):
+    """Parse a [...] class starting after '['; return (characters, index after ']')."""
+    chars = []
+    while i < len(template) and template[i] != "]":
+        char = template[i]
+        if char == "\\" and i + 1 < len(template):
+            i += 1
+            char = template[i]
+        if i + 2 < len(template) and template[i + 1] == "-" and template[i + 2] != "]":
+            end = template[i + 2]
+            if ord(end) < ord(char):
+                raise ValueError(f"Bad range '{char}-{end}' in template")
+            chars.extend(chr(code) for code in range(ord(char), ord(end) + 1))
+            i += 3
+        else:
+            chars.append(char)
+            i += 1
+    if i >= len(template):
+        raise ValueError("Unclosed '[' in template")
+    return "".join(dict.fromkeys(chars)), i + 1
+
+
+def _parse_template(template, words, special_chars):
+    """Split a template into ('chars', characters, count), ('words', list) and ('text', str) parts."""
+    parts = []
+    i = 0
+    while i < len(template):
+        char = template[i]
+        if char == "{":
+            end = template.find("}", i)
+            if end == -1:
+                raise ValueError("Unclosed '{' in template")
+            name, _, count = template[i + 1:end].partition(":")
+            i = end + 1
+            if name in words:
+                if count:
+                    raise ValueError(f"'{{{name}}}' does not take a count")
+                parts.append(["words", words[name]])
+                continue
+            if name == "s":
+                chars = special_chars
+            elif name in TEMPLATE_CLASSES:
+                chars = TEMPLATE_CLASSES[name]
+            else:
+                raise ValueError(f"Unknown placeholder '{{{name}}}' in template")
+            if count and not count.isdigit():
+                raise ValueError(f"Bad count '{count}' in template")
+            parts.append(["chars", chars, int(count) if count else 1])
+            continue
+
+        if char == "[":
+            chars, i = _parse_char_class(template, i + 1)
+        elif char == "\\":
+            if i + 1 >= len(template):
+                raise ValueError("Template ends with a lone '\\'")
+            escaped = template[i + 1]
+            chars = TEMPLATE_ESCAPES.get(escaped, escaped)
+            i += 2
+        else:
+            chars = char
+            i += 1
+
+        # An optional {N} quantifier repeats the single character item before it
+        count = 1
+        if i < len(template) and template[i] == "{":
+            end = template.find("}", i)
+            if end != -1 and template[i + 1:end].isdigit():
+                count = int(template[i + 1:end])
+                i = end + 1
+        if len(chars) == 1:
+            parts.append(["text", chars * count])
+        else:
+            parts.append(["chars", chars, count])
+    return parts
+
+
+def _letter_ranges(words):
+    """(start, end) index ranges of a sorted word sequence whose words start with a letter.
+
+    ASCII letters are found by bisection; only words starting beyond ASCII
+    are looked at one by one.
+    """
+    ranges = []
+    for low, high in (("A", "["), ("a", "{")):
+        start, end = bisect_left(words, low), bisect_left(words, high)
+        if start < end:
+            ranges.append((start, end))
+    start = None
+    for index in range(bisect_left(words, "\x80"), len(words)):
+        if words[index][:1].isalpha():
+            if start is None:
+                start = index
+        elif start is not None:
+            ranges.append((start, index))
+            start = None
+    if start is not None:
+        ranges.append((start, len(words)))
+    return ranges
+
+
+def compile_template(template, adjectives, nouns, special_chars="!@#$%^&*", rng=random,
+                     no_ambiguous=False, start_letter=False):
+    """Compile a username template into a `CompiledTemplate`.
+
+    Placeholders: {adj} and {noun} pick a word; {d:N}, {l:N}, {u:N}, {a:N},
+    {c:N} and {s:N} pick N digits, letters, upper-case letters, lower-case
+    letters, letters-or-digits or special characters. Regex-style items are
+    also understood: character classes like [A-Z] or [a-z0-9_], the escapes
+    \\d and \\w, literal characters, and an {N} repeat after any of them.
+
+    `no_ambiguous` drops easily confused characters (0 O 1 l I |) from every
+    character set. `start_letter` forces the first character to be a letter.
+    """
+    parts = _parse_template(template, {"adj": adjectives, "noun": nouns}, special_chars)
+    if not parts:
+        raise ValueError("Template is empty")
+    for part in parts:
+        if part[0] == "chars" and part[2] and not part[1]:
+            raise ValueError("Template has an empty character set")
+
+    if no_ambiguous:
+        for part in parts:
+            if part[0] == "chars":
+                part[1] = "".join(char for char in part[1] if char not in AMBIGUOUS_CHARS)
+                if not part[1]:
+                    raise ValueError("No characters are left once ambiguous ones are removed")
+
+    # Split off the first character so start_letter can restrict it alone
+    if start_letter:
+        first = parts[0]
+        if first[0] == "text":
+            if not first[1][0].isalpha():
+                raise ValueError("Template starts with a non-letter character")
+        elif first[0] == "chars":
+            letters = "".join(char for char in first[1] if char.isalpha())
+            if not letters:
+                raise ValueError("The first part of the template cannot produce a letter")
+            if first[2] > 1:
+                parts.insert(1, ["chars", first[1], first[2] - 1])
+            parts[0] = ["chars", letters, 1]
+        elif not isinstance(first[1], PackedWordList):
+            first[1] = [word for word in first[1] if word[:1].isalpha()]
+            if not first[1]:
+                raise ValueError("No word starts with a letter")
+        else:
+            first[0] = "letter-words"
+
+    # Merge neighbouring fixed text so each part costs one call
+    merged = []
+    for part in parts:
+        if part[0] == "chars" and part[2] == 0:
+            continue
+        if part[0] == "text" and merged and merged[-1][0] == "text":
+            merged[-1] = ["text", merged[-1][1] + part[1]]
+        else:
+            merged.append(part)
+
+    if all(part[0] == "text" and not part[1] for part in merged):
+        raise ValueError("Template can only produce an empty username")
+
+    keyspace = 1
+    generators = []
+    for part in merged:
+        kind = part[0]
+        if kind == "text":
+            text = part[1]
+            generators.append(lambda text=text: text)
+        elif kind == "chars":
+            chars, count = part[1], part[2]
+            keyspace *= len(chars) ** count
+            if count == 1:
+                generators.append(lambda chars=chars: rng.choice(chars))
+            else:
+                generators.append(lambda chars=chars, count=count: "".join(rng.choices(chars, k=count)))
+        else:
+            words = part[1]
+            if not len(words):
+                raise ValueError("Template uses an empty word list")
+            if kind == "words":
+                keyspace *= len(words)
+                generators.append(lambda words=words: rng.choice(words))
+            else:
+                # Packed lists are sorted, so the letter-initial words form a
+                # few index ranges; a pick is a uniform index across them.
+                ranges = _letter_ranges(words)
+                ends = []
+                total = 0
+                for start, end in ranges:
+                    total += end - start
+                    ends.append(total)
+                if not total:
+                    raise ValueError("No word starts with a letter")
+                keyspace *= total
+
+                def pick_letter_word(words=words, ranges=ranges, ends=ends, total=total):
+                    position = rng.randint(0, total - 1)
+                    which = bisect_right(ends, position)
+                    return words[ranges[which][1] - (ends[which] - position)]
+                generators.append(pick_letter_word)
+
+    if len(generators) == 1:
+        generate = generators[0]
+    else:
+        generators = tuple(generators)
+
+        def generate():
+            return "".join([part() for part in generators])
+
+    return CompiledTemplate(template, generate, keyspace)
+
+
+EXPORT_FORMATS = ("lines", "csv", "jsonl")
+
+
+def _format_batch(batch, fmt, start_index):
+    """Render a batch of usernames as one string in the given export format."""
+    if fmt == "lines":
+        return "\n".join(batch) + "\n"
+    if fmt == "jsonl":
+        return "".join(json.dumps({"index": i, "username": name}) + "\n"
+                       for i, name in enumerate(batch, start_index))
+    import csv
+    import io
+
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(enumerate(batch, start_index))
+    return buffer.getvalue()
+
+
+@timed()
+def export_usernames(usernames, path, fmt="lines", compress=None, batch_size=10000):
+    """Stream usernames from any iterable to a file with constant memory.
+
+    Supported formats are plain lines, CSV (index,username) and JSONL. A path of
+    "-" writes to standard output. Output is gzip-compressed when `compress` is
+    True, or when it is None and the path ends with `.gz`. Usernames are
+    rendered in batches and written with one call per batch, so millions of
+    names never cost one system call per line.
+
+    Returns the number of usernames written.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose one of: {', '.join(EXPORT_FORMATS)}")
+    if compress is None:
+        compress = path.endswith(".gz")
+
+    if path == "-":
+        file = sys.stdout
+    elif compress:
+        import gzip
+
+        file = gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    else:
+        file = open(path, "w", encoding="utf-8", newline="", buffering=1024 * 1024)
+
+    written = 0
+    try:
+        if fmt == "csv":
+            file.write("index,username\n")
+        batch = []
+        for username in usernames:
+            batch.append(username)
+            if len(batch) >= batch_size:
+                file.write(_format_batch(batch, fmt, written + 1))
+                written += len(batch)
+                batch = []
+        if batch:
+            file.write(_format_batch(batch, fmt, written + 1))
+            written += len(batch)
+    finally:
+        if file is sys.stdout:
+            file.flush()
+        else:
+            file.close()
+    return written
+
+
+def _prefix_groups(words):
+    """Split a sorted, unique word sequence into (start, end) index groups.
+
+    A word and every word it prefixes end up in the same group. Two word-mode
+    usernames from different adjectives can only collide when one adjective is
+    a prefix of the other, so shards built from whole groups produce disjoint
+    sets of usernames.
+    """
+    groups = []
+    root = None
+    for index, word in enumerate(words):
+        if root is None or not word.startswith(root):
+            if groups:
+                groups[-1][1] = index
+            root = word
+            groups.append([index, len(words)])
+    return [tuple(group) for group in groups]
+
+
+def _split_into_shards(groups, shard_count):
+    """Merge consecutive (start, end) groups into at most `shard_count` ranges of similar size."""
+    if not groups:
+        return []
+    shard_count = max(1, min(shard_count, len(groups)))
+    first = groups[0][0]
+    total = groups[-1][1] - first
+    shards = []
+    for position, (start, end) in enumerate(groups):
+        # Leave at least one group for every shard that is still missing
+        missing = shard_count - len(shards)
+        target_reached = shards and shards[-1][1] - first >= total * len(shards) / shard_count
+        if not shards or (missing and (target_reached or len(groups) - position <= missing)):
+            shards.append([start, end])
+        else:
+            shards[-1][1] = end
+    return [tuple(shard) for shard in shards]
+
+
+def _apportion(count, weights):
+    """Split `count` into integer parts proportional to `weights` (largest remainder)."""
+    total = sum(weights)
+    exact = [count * weight / total for weight in weights]
+    parts = [int(value) for value in exact]
+    leftovers = sorted(range(len(weights)), key=lambda i: exact[i] - parts[i], reverse=True)
+    for i in leftovers[:count - sum(parts)]:
+        parts[i] += 1
+    return parts
+
+
+def _generate_shard(task):
+    """Worker entry point: write `quota` unique usernames from one keyspace partition."""
+    rng_mode = task["rng_mode"]
+    if rng_mode == "seeded":
+        rng = SeededRandomSource(task["seed"]).spawn(task["shard"])
+    elif rng_mode == "secure":
+        rng = SecureRandomSource()
+    else:
+        # A fresh OS-seeded instance: forked workers would otherwise share
+        # the parent's global random state and repeat each other.
+        rng = random.Random()
+
+    quota = task["quota"]
+    seen = set()
+    batch = []
+    max_attempts = quota * 50 + 1000
+    attempts = 0
+    with open(task["path"], "w", encoding="utf-8") as file:
+        while len(seen) < quota:
+            attempts += 1
+            if attempts > max_attempts:
+                raise RuntimeError(
+                    f"Shard {task['shard']} could only find {len(seen)} of {quota} unique usernames"
+                )
+            if task["mode"] == '1':
+                username = rng.choice(task["first_chars"]) + ''.join(
+                    rng.choices(task["characters"], k=task["length"] - 1))
+            else:
+                username = rng.choice(task["adjectives"]) + rng.choice(task["nouns"])
+                if task["include_numbers"]:
+                    username += str(rng.randint(1, 999))
+                if task["include_special"]:
+                    username += rng.choice(task["special_chars"])
+            if username in seen:
+                continue
+            seen.add(username)
+            batch.append(username)
+            if len(batch) >= 10000:
+                file.write("\n".join(batch) + "\n")
+                batch = []
+        if batch:
+            file.write("\n".join(batch) + "\n")
+    return len(seen)
+
+
+def _read_shards(tasks):
+    """Yield the usernames of every shard file in order."""
+    for task in tasks:
+        with open(task["path"], "r", encoding="utf-8") as part:
+            for line in part:
+                yield line.rstrip("\n")
+
+
 class UsernameGenerator:
-    def __init__(self):
-        self.config_file = "username_generator_config.json"
+    def __init__(self, rng=None, config_file="username_generator_config.json", verbose=True):
+        # config_file=None skips loading custom words; verbose=False silences
+        # the status messages, for library and script use.
+        self.config_file = config_file
+        self.verbose = verbose
+        # Any object with choice/choices/randint works; the global `random`
+        # module keeps the original behaviour.
+        self.rng = rng if rng is not None else random
         self.adjectives = [
             "Happy", "Brave", "Mighty", "Swift", "Clever", "Magic", "Cosmic",
             "Wild", "Noble", "Epic", "Shadow", "Crystal", "Thunder", "Silent"
@@ -17,7 +673,8 @@ class UsernameGenerator:
             "Falcon", "Lion", "Panther", "Wizard", "Runner", "Hunter", "Legend"
         ]
         
-        self.load_word_lists()
+        if self.config_file:
+            self.load_word_lists()
         self.letters = string.ascii_letters
         self.digits = string.digits
         self.special_chars = "!@#$%^&*"
@@ -28,30 +685,58 @@ class UsernameGenerator:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r') as file:
                     data = json.load(file)
-                    self.adjectives = data.get('adjectives', self.adjectives)
-                    self.nouns = data.get('nouns', self.nouns)
-                print("Custom word lists loaded successfully!")
+                    self.adjectives = self._load_words(data.get('adjectives', self.adjectives))
+                    self.nouns = self._load_words(data.get('nouns', self.nouns))
+                if self.verbose:
+                    print("Custom word lists loaded successfully!")
         except Exception as e:
-            print(f"Error loading word lists: {str(e)}")
+            if self.verbose:
+                print(f"Error loading word lists: {str(e)}")
+
+    @staticmethod
+    def _load_words(entry):
+        """Turn a config entry into words: a list is deduplicated, a string names a word list file"""
+        if isinstance(entry, str):
+            return load_wordlist(entry)
+        return list(dict.fromkeys(entry))
+
+    def use_word_files(self, adjectives=None, nouns=None):
+        """Take adjectives and/or nouns from large word list files (text or packed)"""
+        if adjectives:
+            self.adjectives = load_wordlist(adjectives)
+        if nouns:
+            self.nouns = load_wordlist(nouns)
+
+    def close(self):
+        """Close any word list files in use"""
+        for words in (self.adjectives, self.nouns):
+            if isinstance(words, PackedWordList):
+                words.close()
 
     def save_word_lists(self):
         """Save current word lists to file"""
         try:
+            # Packed word lists are saved as their file path, not their contents
             data = {
-                'adjectives': self.adjectives,
-                'nouns': self.nouns
+                'adjectives': self.adjectives.path if isinstance(self.adjectives, PackedWordList) else self.adjectives,
+                'nouns': self.nouns.path if isinstance(self.nouns, PackedWordList) else self.nouns
             }
             with open(self.config_file, 'w') as file:
                 json.dump(data, file, indent=4)
-            print("Word lists saved successfully!")
+            if self.verbose:
+                print("Word lists saved successfully!")
             return True
         except Exception as e:
-            print(f"Error saving word lists: {str(e)}")
+            if self.verbose:
+                print(f"Error saving word lists: {str(e)}")
             return False
 
     def add_custom_words(self):
         """Add custom words to the generator"""
         print("\n=== Add Custom Words ===")
+        if isinstance(self.adjectives, PackedWordList) or isinstance(self.nouns, PackedWordList):
+            print("Word list files are in use. Add words to those files instead.")
+            return
         print("Enter 'done' when finished adding words")
         
         print("\nAdd adjectives:")
@@ -59,7 +744,7 @@ class UsernameGenerator:
             word = input("Enter an adjective (or 'done'): ").strip()
             if word.lower() == 'done':
                 break
-            if word:
+            if word and word not in self.adjectives:
                 self.adjectives.append(word)
 
         print("\nAdd nouns:")
@@ -67,7 +752,7 @@ class UsernameGenerator:
             word = input("Enter a noun (or 'done'): ").strip()
             if word.lower() == 'done':
                 break
-            if word:
+            if word and word not in self.nouns:
                 self.nouns.append(word)
         self.save_word_lists()
 
@@ -106,36 +791,145 @@ class UsernameGenerator:
                 print(f"Error: {str(e)}")
                 print("Please try again.\n")
 
-    def generate_random_username(self, length, include_numbers, include_special):
-        """Generate a random username of specified length"""
+    def build_charset(self, include_numbers, include_special, charset=None):
+        """Return the characters used for random usernames (`charset` overrides the defaults)"""
+        if charset:
+            return charset
         characters = self.letters
         if include_numbers:
             characters += self.digits
         if include_special:
             characters += self.special_chars
-            
-        return ''.join(random.choice(characters) for _ in range(length))
+        return characters
+
+    def generate_random_username(self, length, include_numbers, include_special, charset=None):
+        """Generate a random username of specified length"""
+        characters = self.build_charset(include_numbers, include_special, charset)
+        return ''.join(self.rng.choices(characters, k=length))
 
     def generate_word_username(self, include_numbers, include_special):
         """Generate a username by combining words"""
-        adj = random.choice(self.adjectives)
-        noun = random.choice(self.nouns)
+        adj = self.rng.choice(self.adjectives)
+        noun = self.rng.choice(self.nouns)
         username = adj + noun
         
         if include_numbers:
-            username += str(random.randint(1, 999))
+            username += str(self.rng.randint(1, 999))
         if include_special:
-            username += random.choice(self.special_chars)
+            username += self.rng.choice(self.special_chars)
             
         return username
 
-    def generate_username(self, mode, length, include_numbers, include_special):
+    @timed()
+    def generate_username(self, mode, length, include_numbers, include_special, charset=None):
         """Generate a single username based on preferences"""
         if mode == '1':
-            return self.generate_random_username(length, include_numbers, include_special)
+            return self.generate_random_username(length, include_numbers, include_special, charset)
         else:
             return self.generate_word_username(include_numbers, include_special)
 
+    def compile_template(self, template, no_ambiguous=False, start_letter=False):
+        """Compile a username template against this generator's words and random source"""
+        return compile_template(template, self.adjectives, self.nouns, self.special_chars, self.rng,
+                                no_ambiguous, start_letter)
+
+    def iter_usernames(self, count, mode, length, include_numbers, include_special, charset=None):
+        """Lazily yield `count` usernames, for streaming into `export_usernames`."""
+        for _ in range(count):
+            yield self.generate_username(mode, length, include_numbers, include_special, charset)
+
+    @timed()
+    def generate_sharded(self, count, output_file, mode='2', length=8, include_numbers=True,
+                         include_special=False, workers=None, rng_mode="default", seed=None,
+                         charset=None, fmt="lines", compress=None):
+        """Generate `count` globally unique usernames across a process pool.
+
+        Each worker owns a disjoint slice of the keyspace: random-character
+        usernames are partitioned by their first character, word usernames by
+        adjective range. Workers only deduplicate locally, yet no username can
+        appear in two shards. Shards are written to temporary files and then
+        streamed into `output_file` ("-" for stdout). Plain lines are copied
+        as they are; other formats and compression go through
+        `export_usernames`.
+
+        Returns the number of usernames written.
+        """
+        import multiprocessing
+        import shutil
+        import tempfile
+
+        if rng_mode not in RNG_MODES:
+            raise ValueError(f"Unknown RNG mode '{rng_mode}'. Choose one of: {', '.join(RNG_MODES)}")
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}'. Choose one of: {', '.join(EXPORT_FORMATS)}")
+        if compress is None:
+            compress = output_file.endswith(".gz")
+        workers = workers or os.cpu_count() or 1
+
+        characters = self.build_charset(include_numbers, include_special, charset)
+        # Packed word lists are already sorted and unique, and are sent to the
+        # workers by path rather than by value.
+        nouns = self.nouns if isinstance(self.nouns, PackedWordList) else sorted(set(self.nouns))
+        special_chars = self.special_chars
+
+        if mode == '1':
+            if length < 1:
+                raise ValueError("Length must be at least 1")
+            first_chars = sorted(set(characters))
+            shards = [first_chars[i::workers] for i in range(min(workers, len(first_chars)))]
+            tail_space = len(set(characters)) ** (length - 1)
+            capacities = [len(shard) * tail_space for shard in shards]
+        else:
+            adjectives = self.adjectives
+            if not isinstance(adjectives, PackedWordList):
+                adjectives = sorted(set(adjectives))
+            ranges = _split_into_shards(_prefix_groups(adjectives), workers)
+            shards = [adjectives[start:end] for start, end in ranges]
+            suffix_space = (999 if include_numbers else 1) * (len(special_chars) if include_special else 1)
+            capacities = [len(shard) * len(nouns) * suffix_space for shard in shards]
+
+        if count > sum(capacities):
+            raise ValueError(f"Only {sum(capacities)} unique usernames exist for these settings")
+        quotas = _apportion(count, [len(shard) for shard in shards])
+        for shard, (quota, capacity) in enumerate(zip(quotas, capacities)):
+            if quota > capacity:
+                raise ValueError(f"Shard {shard} needs {quota} usernames but only {capacity} exist")
+
+        temp_parent = None if output_file == "-" else os.path.dirname(os.path.abspath(output_file))
+        temp_dir = tempfile.mkdtemp(prefix="usernames_", dir=temp_parent)
+        try:
+            tasks = []
+            for shard, (partition, quota) in enumerate(zip(shards, quotas)):
+                tasks.append({
+                    "shard": shard,
+                    "quota": quota,
+                    "path": os.path.join(temp_dir, f"shard_{shard}.txt"),
+                    "mode": mode,
+                    "length": length,
+                    "characters": characters,
+                    "first_chars": partition if mode == '1' else None,
+                    "adjectives": partition if mode != '1' else None,
+                    "nouns": nouns,
+                    "special_chars": special_chars,
+                    "include_numbers": include_numbers,
+                    "include_special": include_special,
+                    "rng_mode": rng_mode,
+                    "seed": 0 if seed is None else seed,
+                })
+
+            with multiprocessing.Pool(len(tasks)) as pool:
+                written = sum(pool.map(_generate_shard, tasks))
+
+            if fmt == "lines" and not compress and output_file != "-":
+                with open(output_file, "wb") as output:
+                    for task in tasks:
+                        with open(task["path"], "rb") as part:
+                            shutil.copyfileobj(part, output, 1024 * 1024)
+                return written
+            return export_usernames(_read_shards(tasks), output_file, fmt, compress)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
     def save_usernames(self, usernames):
         """Save generated usernames to a file"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -202,6 +996,121 @@ class UsernameGenerator:
                 print("Invalid option. Please try again.")
         print("\nThank you for using the Username Generator!")
 
+
+MODE_NAMES = {"random": '1', "words": '2', '1': '1', '2': '2'}
+
+
+@timed()
+def generate_usernames(count=1, mode="words", length=8, include_numbers=True, include_special=False,
+                       charset=None, rng="default", seed=None, output=None, fmt="lines",
+                       workers=None, config_file=None, adjectives=None, nouns=None, template=None,
+                       no_ambiguous=False, start_letter=False):
+    """Generate usernames without prompts or console output.
+
+    `mode` is 'random' or 'words' ('1' and '2' are accepted too). Without
+    `output` the usernames are returned as a list; with `output` they are
+    streamed to that path (or "-" for stdout) and the count written is
+    returned. Passing `workers` uses the sharded process pool, which also
+    guarantees unique usernames; it needs an `output` and cannot be combined
+    with a `template`. `adjectives` and `nouns` name word list files (text
+    or packed). A `template` (see `compile_template`) replaces the mode,
+    length and character options.
+    """
+    if mode not in MODE_NAMES:
+        raise ValueError(f"Unknown mode '{mode}'. Choose 'random' or 'words'")
+    mode = MODE_NAMES[mode]
+    if count < 0:
+        raise ValueError("Count must not be negative")
+    if mode == '1' and length < 1:
+        raise ValueError("Length must be at least 1")
+    if workers and template is not None:
+        raise ValueError("Workers cannot be used with a template")
+    if workers and output is None:
+        raise ValueError("Workers need an output to write to")
+
+    profile_count("usernames", count)
+    generator = UsernameGenerator(rng=make_rng(rng, seed), config_file=config_file, verbose=False)
+    try:
+        generator.use_word_files(adjectives, nouns)
+        if template is not None:
+            compiled = generator.compile_template(template, no_ambiguous, start_letter)
+            usernames = (compiled.generate() for _ in range(count))
+            return list(usernames) if output is None else export_usernames(usernames, output, fmt)
+        if output is None:
+            return list(generator.iter_usernames(count, mode, length, include_numbers, include_special, charset))
+        if workers:
+            return generator.generate_sharded(count, output, mode, length, include_numbers, include_special,
+                                              workers, rng, seed, charset, fmt)
+        usernames = generator.iter_usernames(count, mode, length, include_numbers, include_special, charset)
+        return export_usernames(usernames, output, fmt)
+    finally:
+        generator.close()
+
+
+def build_parser():
+    """Build the argument parser for the non-interactive command line."""
+    parser = argparse.ArgumentParser(
+        description="Generate usernames. Run without arguments for the interactive menu.")
+    parser.add_argument("-m", "--mode", choices=["random", "words"], default="words",
+                        help="random characters or adjective + noun (default: words)")
+    parser.add_argument("-l", "--length", type=int, default=8,
+                        help="length of random-character usernames (default: 8)")
+    parser.add_argument("-n", "--count", type=int, default=1, help="number of usernames (default: 1)")
+    parser.add_argument("--no-numbers", action="store_true", help="leave digits out")
+    parser.add_argument("--special", action="store_true", help="include special characters")
+    parser.add_argument("--charset", help="exact characters to use in random mode")
+    parser.add_argument("--rng", choices=RNG_MODES, default="default", help="random source (default: default)")
+    parser.add_argument("--seed", type=int, help="seed for the seeded random source")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default: -)")
+    parser.add_argument("-f", "--format", choices=EXPORT_FORMATS, default="lines",
+                        help="output format (default: lines)")
+    parser.add_argument("-w", "--workers", type=int, help="generate unique usernames with this many processes (not with --template)")
+    parser.add_argument("--config", help="JSON file with custom adjectives and nouns")
+    parser.add_argument("--adjectives", help="word list file (one adjective per line, or packed)")
+    parser.add_argument("--nouns", help="word list file (one noun per line, or packed)")
+    parser.add_argument("-t", "--template", help="username template, e.g. '{adj}{noun}{d:3}' or '[A-Z][a-z]{5}\\d{2}'")
+    parser.add_argument("--no-ambiguous", action="store_true", help="avoid 0 O 1 l I | in templates")
+    parser.add_argument("--start-letter", action="store_true", help="templates must start with a letter")
+    parser.add_argument("--keyspace", action="store_true", help="print the template's keyspace size and exit")
+    return parser
+
+
+def main(argv=None):
+    """Entry point: interactive menu without arguments, CLI otherwise."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        UsernameGenerator().run()
+        return 0
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers and args.template:
+        parser.error("--workers cannot be used with --template")
+    try:
+        if args.keyspace:
+            if not args.template:
+                raise ValueError("--keyspace needs a --template")
+            generator = UsernameGenerator(config_file=args.config, verbose=False)
+            try:
+                generator.use_word_files(args.adjectives, args.nouns)
+                compiled = generator.compile_template(args.template, args.no_ambiguous, args.start_letter)
+                print(compiled.keyspace)
+            finally:
+                generator.close()
+            return 0
+        generate_usernames(
+            count=args.count, mode=args.mode, length=args.length,
+            include_numbers=not args.no_numbers, include_special=args.special,
+            charset=args.charset, rng=args.rng, seed=args.seed, output=args.output,
+            fmt=args.format, workers=args.workers, config_file=args.config,
+            adjectives=args.adjectives, nouns=args.nouns, template=args.template,
+            no_ambiguous=args.no_ambiguous, start_letter=args.start_letter,
+        )
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
 if __name__ == "__main__":
-    generator = UsernameGenerator()
-    generator.run()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,281 @@
+import os
+import sys
+import math
+import glob
+import heapq
+import argparse
+from array import array
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter, mul
+
+from WordVocabulary import WORD_PATTERN, iter_chunks
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """NumPy if it is installed, else None (the plain-array code is used)."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class Corpus:
+    """Document-term matrix over many texts, for TF-IDF and similarity queries.
+
+    Every document is one row of a sparse matrix in CSR form: the term ids
+    of row i are `indices[indptr[i]:indptr[i + 1]]` (sorted) and their counts
+    the same slice of `data`. Terms share one vocabulary (term -> id) across
+    the corpus, and `document_frequency[id]` is the number of documents a
+    term occurs in. All of these are flat arrays, so the matrix costs about
+    8 bytes per (document, term) pair whatever the corpus size.
+
+    TF-IDF weights are computed for the whole matrix at once, with NumPy when
+    it is installed and with C-level map/sum over the arrays otherwise, and
+    are kept until another document is added.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.vocabulary = {}
+        self.terms = []
+        self.indptr = array('Q', [0])
+        self.indices = array('I')
+        self.data = array('I')
+        self.lengths = array('Q')
+        self.document_frequency = array('Q')
+        self._weights = None
+
+    def __len__(self):
+        """Number of documents."""
+        return len(self.names)
+
+    def add_counts(self, name, counts):
+        """Add a document given as a {term: count} mapping; returns its row number."""
+        vocabulary = self.vocabulary
+        terms = self.terms
+        document_frequency = self.document_frequency
+        row = []
+        for term, count in counts.items():
+            term_id = vocabulary.get(term)
+            if term_id is None:
+                term_id = vocabulary[term] = len(terms)
+                terms.append(term)
+                document_frequency.append(0)
+            document_frequency[term_id] += 1
+            row.append((term_id, count))
+        row.sort()
+        self.indices.extend(map(itemgetter(0), row))
+        self.data.extend(map(itemgetter(1), row))
+        self.indptr.append(len(self.indices))
+        self.lengths.append(sum(counts.values()))
+        self.names.append(name)
+        self._weights = None
+        return len(self.names) - 1
+
+    def add_text(self, name, text):
+        """Add a document from a string."""
+        return self.add_counts(name, Counter(WORD_PATTERN.findall(text.lower())))
+
+    def add_file(self, path, name=None, encoding="utf-8"):
+        """Add a document from a text file, read in one streaming pass."""
+        counts = Counter()
+        for chunk in iter_chunks(path, encoding):
+            counts.update(WORD_PATTERN.findall(chunk.lower()))
+        return self.add_counts(name if name is not None else path, counts)
+
+    def add_files(self, paths, encoding="utf-8"):
+        """Add every file of `paths`; files that cannot be read are skipped.
+
+        Returns a list of (path, error message) for the skipped files.
+        """
+        errors = []
+        for path in paths:
+            try:
+                self.add_file(path, encoding=encoding)
+            except OSError as e:
+                errors.append((path, str(e)))
+        return errors
+
+    def row(self, document):
+        """Slice bounds of a document (row number or name) in `indices`/`data`."""
+        if not isinstance(document, int):
+            document = self.names.index(document)
+        return self.indptr[document], self.indptr[document + 1]
+
+    def idf(self):
+        """Smoothed inverse document frequency of every term: ln((1 + N) / (1 + df)) + 1."""
+        documents = len(self.names) + 1
+        log = math.log
+        return array('d', [log(documents / (1 + frequency)) + 1 for frequency in self.document_frequency])
+
+    def tfidf(self):
+        """TF-IDF weight of every stored count, aligned with `indices` and `data`.
+
+        Weights are count * idf, scaled so that every document row has unit
+        length; the dot product of two rows is then their cosine similarity.
+        """
+        if self._weights is None:
+            numpy = _numpy()
+            self._weights = self._tfidf_numpy(numpy) if numpy is not None else self._tfidf_arrays()
+        return self._weights
+
+    def _tfidf_numpy(self, numpy):
+        indices = numpy.frombuffer(self.indices, dtype=numpy.uint32)
+        indptr = numpy.frombuffer(self.indptr, dtype=numpy.uint64).astype(numpy.intp)
+        idf = numpy.frombuffer(self.idf(), dtype=numpy.float64)
+        weights = numpy.frombuffer(self.data, dtype=numpy.uint32) * idf[indices]
+        rows = numpy.repeat(numpy.arange(len(self.names)), numpy.diff(indptr))
+        norms = numpy.sqrt(numpy.bincount(rows, weights=weights * weights, minlength=len(self.names)))
+        weights /= norms[rows]
+        return array('d', weights.tobytes())
+
+    def _tfidf_arrays(self):
+        idf = self.idf()
+        weights = array('d', map(mul, self.data, map(idf.__getitem__, self.indices)))
+        indptr = self.indptr
+        for document in range(len(self.names)):
+            start, stop = indptr[document], indptr[document + 1]
+            if start == stop:
+                continue
+            values = weights[start:stop]
+            norm = math.sqrt(math.fsum(map(mul, values, values)))
+            weights[start:stop] = array('d', [value / norm for value in values])
+        return weights
+
+    def top_terms(self, document, n=10):
+        """The `n` most distinctive terms of a document as (term, weight) pairs."""
+        start, stop = self.row(document)
+        weights = self.tfidf()
+        best = heapq.nlargest(n, range(start, stop), key=weights.__getitem__)
+        return [(self.terms[self.indices[position]], weights[position]) for position in best]
+
+    def distinctive_terms(self, n=10):
+        """{document name: top_terms} for every document."""
+        return {name: self.top_terms(document, n) for document, name in enumerate(self.names)}
+
+    def shared_terms(self, min_documents=None):
+        """Terms found in at least `min_documents` documents (default: all of them).
+
+        Returns (term, document count) pairs, most widespread first.
+        """
+        if min_documents is None:
+            min_documents = len(self.names)
+        shared = [(self.terms[term_id], frequency) for term_id, frequency in enumerate(self.document_frequency)
+                  if frequency >= min_documents]
+        shared.sort(key=itemgetter(1), reverse=True)
+        return shared
+
+    def similarity(self, first, second):
+        """Cosine similarity of two documents' TF-IDF vectors (0 to 1)."""
+        start, stop = self.row(first)
+        weights = self.tfidf()
+        query = dict(zip(self.indices[start:stop], weights[start:stop]))
+        start, stop = self.row(second)
+        return math.fsum(weight * query.get(term_id, 0.0)
+                         for term_id, weight in zip(self.indices[start:stop], weights[start:stop]))
+
+    def most_similar(self, document, n=10):
+        """The `n` documents closest to `document`, as (name, similarity) pairs."""
+        if not isinstance(document, int):
+            document = self.names.index(document)
+        start, stop = self.row(document)
+        weights = self.tfidf()
+        scores = self._scores(self.indices[start:stop], weights[start:stop])
+        scores[document] = -1.0
+        return self._best(scores, n)
+
+    def search(self, text, n=10):
+        """The `n` documents closest to a free-text query, as (name, similarity) pairs."""
+        idf = self.idf()
+        query = {}
+        for term, count in Counter(WORD_PATTERN.findall(text.lower())).items():
+            term_id = self.vocabulary.get(term)
+            if term_id is not None:
+                query[term_id] = count * idf[term_id]
+        norm = math.sqrt(math.fsum(weight * weight for weight in query.values()))
+        if not norm:
+            return []
+        term_ids = sorted(query)
+        return self._best(self._scores(term_ids, [query[term_id] / norm for term_id in term_ids]), n)
+
+    def _scores(self, term_ids, query_weights):
+        """Dot product of a sparse query vector with every document row."""
+        weights = self.tfidf()
+        numpy = _numpy()
+        if numpy is not None:
+            dense = numpy.zeros(len(self.terms))
+            dense[numpy.asarray(term_ids, dtype=numpy.intp)] = query_weights
+            indptr = numpy.frombuffer(self.indptr, dtype=numpy.uint64).astype(numpy.intp)
+            rows = numpy.repeat(numpy.arange(len(self.names)), numpy.diff(indptr))
+            products = numpy.frombuffer(weights, dtype=numpy.float64) * dense[numpy.frombuffer(self.indices, numpy.uint32)]
+            return array('d', numpy.bincount(rows, weights=products, minlength=len(self.names)).tobytes())
+        dense = array('d', bytes(8 * len(self.terms)))
+        for term_id, weight in zip(term_ids, query_weights):
+            dense[term_id] = weight
+        products = array('d', map(mul, weights, map(dense.__getitem__, self.indices)))
+        indptr = self.indptr
+        return array('d', [sum(products[indptr[document]:indptr[document + 1]])
+                           for document in range(len(self.names))])
+
+    def _best(self, scores, n):
+        best = heapq.nlargest(n, range(len(scores)), key=scores.__getitem__)
+        return [(self.names[document], scores[document]) for document in best if scores[document] > 0]
+
+
+def load_corpus(paths, pattern="*.txt", encoding="utf-8"):
+    """Build a Corpus from files and directories (searched recursively for `pattern`).
+
+    Returns (corpus, errors) where errors lists (path, message) for unreadable files.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "**", pattern), recursive=True)))
+        else:
+            files.append(path)
+    corpus = Corpus()
+    errors = corpus.add_files(files, encoding)
+    return corpus, errors
+
+
+def main(argv=None):
+    """Compare documents from the command line."""
+    parser = argparse.ArgumentParser(description="Compare text files by TF-IDF.")
+    parser.add_argument("paths", nargs="+", help="text files, or directories to search")
+    parser.add_argument("-p", "--pattern", default="*.txt", help="file pattern inside directories (default: *.txt)")
+    parser.add_argument("-n", "--top", type=int, default=5, help="terms or documents to list (default: 5)")
+    parser.add_argument("--similar", metavar="FILE", help="list the documents most similar to this one")
+    parser.add_argument("--search", metavar="TEXT", help="list the documents that best match this text")
+    parser.add_argument("--shared", action="store_true", help="list the terms every document shares")
+    args = parser.parse_args(argv)
+
+    corpus, errors = load_corpus(args.paths, args.pattern)
+    for path, message in errors:
+        print(f"Skipped {path}: {message}", file=sys.stderr)
+    if not len(corpus):
+        print("No documents found.", file=sys.stderr)
+        return 1
+    print(f"{len(corpus)} documents, {len(corpus.terms)} distinct terms, {sum(corpus.lengths)} words")
+
+    if args.similar:
+        if args.similar not in corpus.names:
+            parser.error(f"'{args.similar}' is not one of the documents")
+        for name, score in corpus.most_similar(args.similar, args.top):
+            print(f"{score:.3f}  {name}")
+    elif args.search:
+        for name, score in corpus.search(args.search, args.top):
+            print(f"{score:.3f}  {name}")
+    elif args.shared:
+        for term, frequency in corpus.shared_terms()[:args.top]:
+            print(f"{term}: {frequency}")
+    else:
+        for name, terms in corpus.distinctive_terms(args.top).items():
+            print(f"{name}: {', '.join(term for term, _ in terms)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
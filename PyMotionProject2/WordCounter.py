@@ -1,18 +1,45 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import re
+import os
 
-def count_words(text):
-    """Counts words in the given text and returns word count and frequency."""
+from WordVocabulary import VocabularyStore, count_file
+from WordCorpus import Corpus
+from _profiling import timed, span, profile_count
+
+# Vocabulary size (bytes, estimated) above which "Count Large File" spills counts to disk
+LARGE_FILE_MEMORY_BUDGET = 256 << 20
+
+@timed()
+def count_word_store(text):
+    """Counts words in the given text and returns word count and a VocabularyStore.
+
+    The store has `items()` and `most_common(n)`; count_words returns the
+    same counts as a plain dict.
+    """
     words = re.findall(r'\b\w+\b', text.lower())  # Extract words ignoring punctuation
     word_count = len(words)
-    word_freq = {}
-    
-    for word in words:
-        word_freq[word] = word_freq.get(word, 0) + 1
+    word_freq = VocabularyStore()
+    word_freq.update(words)
     
+    profile_count("words", word_count)
     return word_count, word_freq
 
+@timed()
+def count_words(text):
+    """Counts words in the given text and returns word count and frequency."""
+    word_count, store = count_word_store(text)
+    return word_count, dict(store.items())
+
+def show_results(word_count, word_freq):
+    """Displays the total word count and the top 5 words."""
+    output_label.config(text=f"Total Words: {word_count}")
+    
+    # Display top 5 most frequent words
+    sorted_words = word_freq.most_common(5)
+    freq_text = "\n".join([f"{word}: {count}" for word, count in sorted_words])
+    freq_label.config(text=f"Top 5 Words:\n{freq_text}")
+
 def process_text():
     """Handles text input from the user and displays word count."""
     text = text_input.get("1.0", tk.END).strip()
@@ -21,13 +48,8 @@ def process_text():
         messagebox.showerror("Error", "Please enter some text.")
         return
     
-    word_count, word_freq = count_words(text)
-    output_label.config(text=f"Total Words: {word_count}")
-    
-    # Display top 5 most frequent words
-    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:5]
-    freq_text = "\n".join([f"{word}: {count}" for word, count in sorted_words])
-    freq_label.config(text=f"Top 5 Words:\n{freq_text}")
+    word_count, word_freq = count_word_store(text)
+    show_results(word_count, word_freq)
 
 def load_file():
     """Loads text from a selected file."""
@@ -37,34 +59,85 @@ def load_file():
         return
     
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
+        with span("load_file"), open(file_path, "r", encoding="utf-8") as file:
             text = file.read()
             text_input.delete("1.0", tk.END)
             text_input.insert(tk.END, text)
     except Exception as e:
         messagebox.showerror("Error", f"Failed to load file: {e}")
 
-# GUI Setup
-root = tk.Tk()
-root.title("Advanced Word Counter")
-root.geometry("500x400")
-
-# Widgets
-tk.Label(root, text="Enter Text or Load a File:", font=("Arial", 12)).pack(pady=5)
-text_input = tk.Text(root, height=5, width=50)
-text_input.pack(pady=5)
-
-btn_frame = tk.Frame(root)
-btn_frame.pack(pady=5)
-
-tk.Button(btn_frame, text="Count Words", command=process_text).grid(row=0, column=0, padx=5)
-tk.Button(btn_frame, text="Load File", command=load_file).grid(row=0, column=1, padx=5)
+def count_large_file():
+    """Counts a file chunk by chunk without loading it into the input box."""
+    file_path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
+    
+    if not file_path:
+        return
+    
+    try:
+        with span("count_large_file"), count_file(file_path, LARGE_FILE_MEMORY_BUDGET) as word_freq:
+            show_results(word_freq.total, word_freq)
+    except Exception as e:
+        messagebox.showerror("Error", f"Failed to count file: {e}")
 
-output_label = tk.Label(root, text="Total Words: 0", font=("Arial", 12, "bold"))
-output_label.pack(pady=5)
+def compare_files():
+    """Compares several files: their distinctive terms and the words they share."""
+    file_paths = filedialog.askopenfilenames(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
+    
+    if not file_paths:
+        return
+    
+    corpus = Corpus()
+    with span("compare_files"):
+        errors = corpus.add_files(file_paths)
+        distinctive = corpus.distinctive_terms(5)
+    if errors:
+        messagebox.showerror("Error", "Failed to load:\n" + "\n".join(f"{path}: {e}" for path, e in errors))
+    if not len(corpus):
+        return
+    
+    lines = [f"{len(corpus)} files, {len(corpus.terms)} distinct words", ""]
+    for name, terms in distinctive.items():
+        lines.append(f"{os.path.basename(name)}: {', '.join(term for term, _ in terms)}")
+    shared = corpus.shared_terms()[:10]
+    lines += ["", "Shared by every file: " + (", ".join(term for term, _ in shared) or "none")]
+    
+    window = tk.Toplevel()
+    window.title("Corpus Comparison")
+    report = tk.Text(window, height=20, width=70, wrap="word")
+    report.pack(fill="both", expand=True, padx=5, pady=5)
+    report.insert(tk.END, "\n".join(lines))
+    report.config(state="disabled")
 
-freq_label = tk.Label(root, text="", font=("Arial", 10))
-freq_label.pack(pady=5)
+def main():
+    """Builds the GUI and runs the application."""
+    global text_input, output_label, freq_label
+    
+    # GUI Setup
+    root = tk.Tk()
+    root.title("Advanced Word Counter")
+    root.geometry("500x400")
+    
+    # Widgets
+    tk.Label(root, text="Enter Text or Load a File:", font=("Arial", 12)).pack(pady=5)
+    text_input = tk.Text(root, height=5, width=50)
+    text_input.pack(pady=5)
+    
+    btn_frame = tk.Frame(root)
+    btn_frame.pack(pady=5)
+    
+    tk.Button(btn_frame, text="Count Words", command=process_text).grid(row=0, column=0, padx=5)
+    tk.Button(btn_frame, text="Load File", command=load_file).grid(row=0, column=1, padx=5)
+    tk.Button(btn_frame, text="Count Large File", command=count_large_file).grid(row=0, column=2, padx=5)
+    tk.Button(btn_frame, text="Compare Files", command=compare_files).grid(row=0, column=3, padx=5)
+    
+    output_label = tk.Label(root, text="Total Words: 0", font=("Arial", 12, "bold"))
+    output_label.pack(pady=5)
+    
+    freq_label = tk.Label(root, text="", font=("Arial", 10))
+    freq_label.pack(pady=5)
+    
+    # Run the application
+    root.mainloop()
 
-# Run the application
-root.mainloop()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import os
+import re
+import sys
+import heapq
+import tempfile
+from collections import Counter
+from operator import itemgetter
+
+# Same tokens as count_words: runs of word characters, lowercased
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+# Bytes one vocabulary entry costs besides its characters and its hash table
+# slot: the str object header plus a boxed count. Counts up to 256 are shared
+# small ints, so this errs on the high side, which makes spilling early
+# rather than late.
+ENTRY_OVERHEAD = sys.getsizeof("") + sys.getsizeof(1 << 30)
+
+# A run of word characters at the start of a string
+TRAILING_WORD = re.compile(r'\w*')
+
+# Characters read from a file per tokenizing step
+READ_CHUNK = 1 << 20
+
+
+class VocabularyStore:
+    """Word frequency table that can spill to disk, for very large vocabularies.
+
+    Counts are kept in a collections.Counter (a plain dict from word to count);
+    words are added a chunk at a time through `update`, which counts the
+    tokens in place, in C, without building a second table.
+
+    With a `memory_budget` (bytes), the table is written to a sorted run file
+    on disk whenever its estimated size passes the budget, and then starts
+    again empty; reading the counts merges the runs with the table. Memory
+    therefore stays bounded however many distinct words the input holds.
+    The estimate is the dict's own size (sys.getsizeof) plus ENTRY_OVERHEAD
+    and the characters of every word. Lookups of single words have to scan
+    the runs once anything is spilled; `items` and `most_common` stream
+    through them in one merge.
+    """
+
+    def __init__(self, memory_budget=None, spill_dir=None):
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self.counts = Counter()
+        self.total = 0
+        self.characters = 0  # characters of the words in `counts` (estimated)
+        self.runs = []
+        self._temp_dir = None
+
+    @property
+    def estimated_bytes(self):
+        """Estimated memory used by the in-memory table."""
+        return sys.getsizeof(self.counts) + len(self.counts) * ENTRY_OVERHEAD + self.characters
+
+    def __len__(self):
+        """Number of distinct words."""
+        if not self.runs:
+            return len(self.counts)
+        return sum(1 for _ in self.items())
+
+    def __contains__(self, word):
+        return self.get(word) > 0
+
+    def __getitem__(self, word):
+        return self.get(word)
+
+    def get(self, word, default=0):
+        """Count of `word` (`default` if it never occurred)."""
+        found = self.counts.get(word, 0)
+        for path in self.runs:
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    token, _, count = line.rstrip("\n").rpartition("\t")
+                    # Runs are sorted, so the word cannot come later
+                    if token >= word:
+                        if token == word:
+                            found += int(count)
+                        break
+        return found if found else default
+
+    def add(self, word, amount=1):
+        """Count `word` `amount` more times."""
+        self.update({word: amount})
+
+    def update(self, words):
+        """Count every word of a list of words, or merge a {word: count} mapping."""
+        counts = self.counts
+        before = len(counts)
+        if hasattr(words, "items"):
+            self.characters += sum(len(word) for word in words if word not in counts)
+            counts.update(words)
+            self.total += sum(words.values())
+        else:
+            if not isinstance(words, list):
+                words = list(words)
+            counts.update(words)
+            self.total += len(words)
+            new_words = len(counts) - before
+            if new_words and words:
+                # New words are assumed to be as long as the chunk's words on average
+                self.characters += new_words * sum(map(len, words)) // len(words)
+        if self.memory_budget is not None and self.estimated_bytes > self.memory_budget:
+            self.spill()
+
+    def spill(self):
+        """Write the in-memory table to a sorted run file and empty it."""
+        if not self.counts:
+            return
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="vocabulary-", dir=self.spill_dir)
+        path = os.path.join(self._temp_dir.name, f"run-{len(self.runs)}.tsv")
+        with open(path, "w", encoding="utf-8", buffering=READ_CHUNK) as file:
+            for word, count in sorted(self.counts.items()):
+                file.write(f"{word}\t{count}\n")
+        self.runs.append(path)
+        self.counts = Counter()
+        self.characters = 0
+
+    def _read_run(self, path):
+        with open(path, encoding="utf-8", buffering=READ_CHUNK) as file:
+            for line in file:
+                word, _, count = line.rstrip("\n").rpartition("\t")
+                yield word, int(count)
+
+    def items(self):
+        """Yield (word, count) for every distinct word.
+
+        Without spilled runs this is in first-seen order; otherwise words
+        come out sorted, merged from the runs and the in-memory table.
+        """
+        if not self.runs:
+            yield from self.counts.items()
+            return
+        in_memory = sorted(self.counts.items())
+        merged = heapq.merge(in_memory, *(self._read_run(path) for path in self.runs), key=itemgetter(0))
+        current, total = None, 0
+        for word, count in merged:
+            if word != current:
+                if current is not None:
+                    yield current, total
+                current, total = word, 0
+            total += count
+        if current is not None:
+            yield current, total
+
+    def most_common(self, n):
+        """The `n` most frequent words as (word, count) pairs, most frequent first."""
+        return heapq.nlargest(n, self.items(), key=itemgetter(1))
+
+    def close(self):
+        """Delete any spilled run files."""
+        self.runs = []
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def count_text(text, store=None):
+    """Tokenize `text` like count_words and add its words to a VocabularyStore."""
+    store = store if store is not None else VocabularyStore()
+    store.update(WORD_PATTERN.findall(text.lower()))
+    return store
+
+
+def iter_chunks(path, encoding="utf-8"):
+    """Yield the text of a file in pieces of about READ_CHUNK characters.
+
+    Pieces are cut after the last non-word character, so no word is split
+    between two; only a "word" longer than a whole piece is cut anyway.
+    """
+    with open(path, "r", encoding=encoding, errors="replace") as file:
+        carry = ""
+        while True:
+            chunk = file.read(READ_CHUNK)
+            if not chunk:
+                break
+            chunk = carry + chunk
+            # The word run at the end, found from the reversed text so only it is scanned
+            trailing = TRAILING_WORD.match(chunk[::-1]).end()
+            if trailing == len(chunk):
+                trailing = 0
+            cut = len(chunk) - trailing
+            carry = chunk[cut:]
+            yield chunk[:cut]
+        if carry:
+            yield carry
+
+
+def count_file(path, memory_budget=None, encoding="utf-8"):
+    """Count the words of a text file of any size, one chunk at a time.
+
+    Returns the VocabularyStore; its `total` is the word count.
+    """
+    store = VocabularyStore(memory_budget)
+    for chunk in iter_chunks(path, encoding):
+        count_text(chunk, store)
+    return store
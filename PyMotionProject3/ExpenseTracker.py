@@ -1,8 +1,110 @@
 import os
 import json
+import functools
+from collections import OrderedDict
 from datetime import datetime
 import calendar
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from _profiling import timed, profile_count
+
+
+class QueryCache:
+    """
+    Least-recently-used cache of query results, with hit and miss counts.
+    """
+    
+    def __init__(self, maxsize: int = 128):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            maxsize: The most results kept; 0 disables caching
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+    
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """
+        Look up a result, marking it as recently used.
+        
+        Args:
+            key: The query key
+            
+        Returns:
+            Tuple of (found, result)
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            profile_count("query_cache_hits")
+            return True, self._entries[key]
+        self.misses += 1
+        profile_count("query_cache_misses")
+        return False, None
+    
+    def put(self, key: Tuple, result: Any) -> None:
+        """
+        Store a result, evicting the least recently used one if the cache is full.
+        
+        Args:
+            key: The query key
+            result: The result to store
+        """
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove every stored result (the hit and miss counts are kept)."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _copy_result(result: Any) -> Any:
+    """Copy a query result, including its nested lists, dicts and expense records."""
+    if isinstance(result, list):
+        return [_copy_result(item) if isinstance(item, (list, dict)) else item for item in result]
+    if isinstance(result, dict):
+        return {key: _copy_result(value) if isinstance(value, (list, dict)) else value
+                for key, value in result.items()}
+    return result
+
+
+def cached_query(method: Callable) -> Callable:
+    """
+    Serve repeated calls of a query method from the tracker's QueryCache.
+    
+    Results are keyed by the method name, its arguments and the tracker's
+    data version, which every add, edit and delete bumps, so a result
+    computed before a write is never returned after it. Empty results are
+    not cached, so invalid input is reported on every call, and calls with
+    unhashable arguments are simply not cached. The cache keeps its own copy
+    of every result, expense records included, and callers get a fresh copy,
+    so changing a returned record never changes the tracker or the cache.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (self.version, method.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            found, result = self.query_cache.get(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        if not found:
+            result = method(self, *args, **kwargs)
+            if not result:
+                return result
+            result = _copy_result(result)
+            self.query_cache.put(key, result)
+        return _copy_result(result)
+    return wrapper
 
 
 class ExpenseTracker:
@@ -10,12 +112,13 @@ class ExpenseTracker:
     Expense Tracker application that allows users to track and analyze their daily expenses.
     """
     
-    def __init__(self, data_file: str = "expenses.json"):
+    def __init__(self, data_file: str = "expenses.json", cache_size: int = 128):
         """
         Initialize the Expense Tracker with a data file.
         
         Args:
             data_file: The file path to store expense data
+            cache_size: How many query results to keep cached (0 disables the cache)
         """
         self.data_file = data_file
         self.categories = [
@@ -23,7 +126,11 @@ class ExpenseTracker:
             "Shopping", "Utilities", "Healthcare", "Education", "Other"
         ]
         self.expenses = self._load_data()
+        # Bumped by every change to self.expenses; part of every query cache key
+        self.version = 0
+        self.query_cache = QueryCache(cache_size)
         
+    @timed()
     def _load_data(self) -> List[Dict[str, Any]]:
         """Load expense data from the data file."""
         if os.path.exists(self.data_file):
@@ -35,14 +142,39 @@ class ExpenseTracker:
                 return []
         return []
     
+    @timed()
     def _save_data(self) -> None:
         """Save expense data to the data file."""
         try:
             with open(self.data_file, 'w') as file:
                 json.dump(self.expenses, file, indent=4)
+            profile_count("expenses_saved", len(self.expenses))
         except Exception as e:
             print(f"Error saving data: {e}")
     
+    def _invalidate(self) -> None:
+        """Mark the expense data as changed, so no cached query result is reused."""
+        self.version += 1
+        self.query_cache.clear()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get query cache statistics.
+        
+        Returns:
+            Dictionary with hits, misses, hit rate, cached results, size limit and data version
+        """
+        cache = self.query_cache
+        lookups = cache.hits + cache.misses
+        return {
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "hit_rate": cache.hits / lookups if lookups else 0.0,
+            "size": len(cache),
+            "maxsize": cache.maxsize,
+            "version": self.version
+        }
+    
     def add_expense(self, amount: float, description: str, category: str, date: Optional[str] = None) -> bool:
         """
         Add a new expense to the tracker.
@@ -85,6 +217,7 @@ class ExpenseTracker:
             }
             
             self.expenses.append(expense)
+            self._invalidate()
             self._save_data()
             print(f"Expense of ${amount:.2f} added successfully.")
             return True
@@ -106,6 +239,7 @@ class ExpenseTracker:
         for i, expense in enumerate(self.expenses):
             if expense["id"] == expense_id:
                 del self.expenses[i]
+                self._invalidate()
                 self._save_data()
                 print(f"Expense with ID {expense_id} deleted successfully.")
                 return True
@@ -126,6 +260,9 @@ class ExpenseTracker:
         """
         for expense in self.expenses:
             if expense["id"] == expense_id:
+                # Fields may change even if a later one fails validation
+                self._invalidate()
+                
                 # Validate and update fields
                 try:
                     if "amount" in kwargs:
@@ -163,9 +300,17 @@ class ExpenseTracker:
         return False
     
     def get_all_expenses(self) -> List[Dict[str, Any]]:
-        """Get all expenses."""
-        return self.expenses
+        """
+        Get all expenses.
+        
+        Returns:
+            Copies of every expense record; change expenses with edit_expense
+            so cached query results stay correct
+        """
+        return [dict(expense) for expense in self.expenses]
     
+    @cached_query
+    @timed()
     def get_expenses_by_category(self, category: str) -> List[Dict[str, Any]]:
         """
         Get all expenses in a specific category.
@@ -182,6 +327,8 @@ class ExpenseTracker:
             
         return [e for e in self.expenses if e["category"] == category]
     
+    @cached_query
+    @timed()
     def get_expenses_by_date_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """
         Get expenses within a date range.
@@ -205,6 +352,8 @@ class ExpenseTracker:
             print(f"Error: {e}")
             return []
     
+    @cached_query
+    @timed()
     def get_monthly_summary(self, year: int, month: int) -> Dict[str, Any]:
         """
         Get a summary of expenses for a specific month.
@@ -226,8 +375,8 @@ class ExpenseTracker:
             start_date = f"{year}-{month:02d}-01"
             end_date = f"{year}-{month:02d}-{last_day:02d}"
             
-            # Get expenses for the month
-            monthly_expenses = self.get_expenses_by_date_range(start_date, end_date)
+            # Get expenses for the month (uncached: this summary is cached as a whole)
+            monthly_expenses = ExpenseTracker.get_expenses_by_date_range.__wrapped__(self, start_date, end_date)
             
             # Calculate total
             total = sum(expense["amount"] for expense in monthly_expenses)
@@ -257,6 +406,8 @@ class ExpenseTracker:
             print(f"Error: {e}")
             return {}
     
+    @cached_query
+    @timed()
     def get_annual_summary(self, year: int) -> Dict[str, Any]:
         """
         Get a summary of expenses for a specific year.
@@ -272,8 +423,8 @@ class ExpenseTracker:
             start_date = f"{year}-01-01"
             end_date = f"{year}-12-31"
             
-            # Get expenses for the year
-            annual_expenses = self.get_expenses_by_date_range(start_date, end_date)
+            # Get expenses for the year (uncached: this summary is cached as a whole)
+            annual_expenses = ExpenseTracker.get_expenses_by_date_range.__wrapped__(self, start_date, end_date)
             
             # Calculate total
             total = sum(expense["amount"] for expense in annual_expenses)
@@ -281,7 +432,7 @@ class ExpenseTracker:
             # Calculate monthly breakdown
             monthly_totals = {}
             for month in range(1, 13):
-                month_summary = self.get_monthly_summary(year, month)
+                month_summary = ExpenseTracker.get_monthly_summary.__wrapped__(self, year, month)
                 monthly_totals[calendar.month_name[month]] = month_summary["total_expenses"]
             
             # Calculate category breakdown
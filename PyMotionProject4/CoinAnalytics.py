@@ -0,0 +1,206 @@
+import math
+from collections import deque
+
+from CoinSimulator import _longest_run, _leading_run, _trailing_run
+
+# Outcomes are 1 for Heads and 0 for Tails throughout.
+
+
+def chi_square_p_value(chi_square):
+    """Upper-tail p-value of a chi-square statistic with one degree of freedom."""
+    return math.erfc(math.sqrt(chi_square / 2))
+
+
+def normal_p_value(z):
+    """Two-sided p-value of a standard normal z-score."""
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+class StreamingAnalytics:
+    """Online fairness statistics for a stream of coin flips.
+
+    Every flip is folded in with O(1) work (O(max_lag) for the autocorrelation
+    sums), and whole simulation blocks can be folded in with `update_bits`.
+    Tracked: chi-square with a proper p-value, the Wald-Wolfowitz runs test,
+    the longest streak of each side, lag-k autocorrelation for k up to
+    `max_lag`, and a two-sided sequential probability ratio test (SPRT) of a
+    fair coin against one with P(Heads) = 0.5 +/- `sprt_effect`, which stops
+    as soon as either hypothesis is accepted.
+    """
+
+    def __init__(self, max_lag=5, sprt_effect=0.05, alpha=0.05, beta=0.05):
+        if not 0 < sprt_effect < 0.5:
+            raise ValueError("sprt_effect must be between 0 and 0.5")
+        self.max_lag = max_lag
+        self.sprt_effect = sprt_effect
+        self.alpha = alpha
+        self.beta = beta
+        # Log-likelihood ratio step per Heads/Tails for the "biased towards Heads" alternative;
+        # the "biased towards Tails" alternative uses the same steps swapped.
+        high = 0.5 + sprt_effect
+        self._llr_heads = math.log(high / 0.5)
+        self._llr_tails = math.log((1 - high) / 0.5)
+        self._upper = math.log((1 - beta) / alpha)
+        self._lower = math.log(beta / (1 - alpha))
+        self.reset()
+
+    def reset(self):
+        """Forget every flip seen so far."""
+        self.flips = 0
+        self.heads = 0
+        self.runs = 0
+        self.longest_streaks = [0, 0]  # indexed by outcome: [Tails, Heads]
+        self.streak_value = None
+        self.streak_length = 0
+        self.lag_products = [0] * (self.max_lag + 1)
+        self.first_outcomes = []
+        self.recent_outcomes = deque(maxlen=self.max_lag)
+        self.sprt_decision = None
+        self.sprt_decided_at = None
+
+    @property
+    def tails(self):
+        return self.flips - self.heads
+
+    def update(self, outcome):
+        """Fold in a single flip."""
+        outcome = 1 if outcome else 0
+        self.flips += 1
+        self.heads += outcome
+
+        if outcome == self.streak_value:
+            self.streak_length += 1
+        else:
+            self.runs += 1
+            self.streak_value = outcome
+            self.streak_length = 1
+        if self.streak_length > self.longest_streaks[outcome]:
+            self.longest_streaks[outcome] = self.streak_length
+
+        if outcome:
+            recent = self.recent_outcomes
+            for lag in range(1, len(recent) + 1):
+                self.lag_products[lag] += recent[-lag]
+        if len(self.first_outcomes) < self.max_lag:
+            self.first_outcomes.append(outcome)
+        self.recent_outcomes.append(outcome)
+
+        self._check_sprt()
+
+    def update_bits(self, bits, size):
+        """Fold in a block of `size` flips packed into an integer (bit 0 = first flip).
+
+        Counts, runs and lag products are computed with whole-block integer
+        operations. The SPRT is checked once per block, so on batch data it
+        stops at the end of the block in which a decision is reached.
+        """
+        if size <= 0:
+            return
+        mask = (1 << size) - 1
+        bits &= mask
+        inverted = ~bits & mask
+        recent = list(self.recent_outcomes)
+
+        # Runs: a new run starts at every change between neighbouring flips
+        changes = ((bits ^ (bits >> 1)) & ((1 << (size - 1)) - 1)).bit_count()
+        first_value = bits & 1
+        self.runs += changes + (0 if first_value == self.streak_value else 1)
+
+        # Longest streaks, joining the streak carried over from before the block
+        self.longest_streaks[1] = max(self.longest_streaks[1], _longest_run(bits))
+        self.longest_streaks[0] = max(self.longest_streaks[0], _longest_run(inverted))
+        first_run = _leading_run(bits if first_value else inverted, size)
+        joined = first_run + (self.streak_length if first_value == self.streak_value else 0)
+        self.longest_streaks[first_value] = max(self.longest_streaks[first_value], joined)
+        if first_run == size:
+            self.streak_value, self.streak_length = first_value, joined
+        else:
+            last_value = (bits >> (size - 1)) & 1
+            self.streak_value = last_value
+            self.streak_length = _trailing_run(bits if last_value else inverted, size)
+
+        # Lag products: pairs inside the block, plus pairs reaching back into `recent`
+        for lag in range(1, self.max_lag + 1):
+            if lag < size:
+                self.lag_products[lag] += (bits & (bits >> lag)).bit_count()
+            for position in range(min(lag, size)):
+                back = lag - position
+                if back <= len(recent) and (bits >> position) & 1:
+                    self.lag_products[lag] += recent[-back]
+
+        # Keep the first and last `max_lag` outcomes for the autocorrelation edges
+        for position in range(min(size, self.max_lag - len(self.first_outcomes))):
+            self.first_outcomes.append((bits >> position) & 1)
+        for position in range(max(0, size - self.max_lag), size):
+            self.recent_outcomes.append((bits >> position) & 1)
+
+        self.flips += size
+        self.heads += bits.bit_count()
+        self._check_sprt()
+
+    def _check_sprt(self):
+        """Latch the SPRT decision the first time a boundary is crossed."""
+        if self.sprt_decision is not None:
+            return
+        towards_heads = self.heads * self._llr_heads + self.tails * self._llr_tails
+        towards_tails = self.heads * self._llr_tails + self.tails * self._llr_heads
+        if towards_heads >= self._upper or towards_tails >= self._upper:
+            self.sprt_decision = "biased"
+        elif towards_heads <= self._lower and towards_tails <= self._lower:
+            self.sprt_decision = "fair"
+        else:
+            return
+        self.sprt_decided_at = self.flips
+
+    def chi_square(self):
+        """Chi-square statistic of the counts against a fair coin."""
+        if not self.flips:
+            return 0.0
+        expected = self.flips / 2
+        return ((self.heads - expected) ** 2 + (self.tails - expected) ** 2) / expected
+
+    def chi_square_p_value(self):
+        return chi_square_p_value(self.chi_square())
+
+    def runs_test(self):
+        """Wald-Wolfowitz runs test: return (z-score, two-sided p-value), or None if undefined."""
+        n1, n2, n = self.heads, self.tails, self.flips
+        if n1 == 0 or n2 == 0 or n < 2:
+            return None
+        mean = 2 * n1 * n2 / n + 1
+        variance = 2 * n1 * n2 * (2 * n1 * n2 - n) / (n * n * (n - 1))
+        if variance <= 0:
+            return None
+        z = (self.runs - mean) / math.sqrt(variance)
+        return z, normal_p_value(z)
+
+    def autocorrelation(self, lag=1):
+        """Sample autocorrelation of the outcomes at the given lag (0.0 if undefined)."""
+        if not 1 <= lag <= self.max_lag:
+            raise ValueError(f"lag must be between 1 and {self.max_lag}")
+        n = self.flips
+        if n <= lag or self.heads in (0, n):
+            return 0.0
+        mean = self.heads / n
+        # With 0/1 outcomes every sum reduces to counts kept by update()
+        later_sum = self.heads - sum(self.first_outcomes[:lag])
+        earlier_sum = self.heads - sum(list(self.recent_outcomes)[-lag:])
+        covariance = self.lag_products[lag] - mean * (later_sum + earlier_sum) + (n - lag) * mean * mean
+        variance = self.heads - n * mean * mean
+        return covariance / variance
+
+    def summary(self):
+        """Short multi-line description of the current statistics."""
+        if self.flips < 2:
+            return "Not enough flips for analytics yet."
+        lines = [f"Chi² = {self.chi_square():.2f} (p = {self.chi_square_p_value():.4f})"]
+        runs = self.runs_test()
+        if runs:
+            lines.append(f"Runs test: {self.runs:,} runs, z = {runs[0]:.2f} (p = {runs[1]:.4f})")
+        lines.append(f"Longest streaks: Heads {self.longest_streaks[1]}, Tails {self.longest_streaks[0]}")
+        lines.append(f"Lag-1 autocorrelation: {self.autocorrelation(1):+.4f}")
+        if self.sprt_decision:
+            lines.append(f"SPRT: {self.sprt_decision} after {self.sprt_decided_at:,} flips")
+        else:
+            lines.append("SPRT: undecided")
+        return "\n".join(lines)
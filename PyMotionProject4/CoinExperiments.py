@@ -0,0 +1,166 @@
+import os
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import multiprocessing
+
+from CoinSimulator import biased_bits
+from CoinAnalytics import chi_square_p_value
+
+# Trials handed to a worker at once; large enough to amortise process overhead
+TRIALS_PER_TASK = 250
+
+
+def trial_rng(seed, p, flips, trial):
+    """Independent random stream for one trial.
+
+    The stream depends only on the experiment seed and the trial's parameters
+    and index, so results are identical whatever the number of workers or the
+    order in which tasks run.
+    """
+    digest = hashlib.sha256(f"{seed}:{p!r}:{flips}:{trial}".encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:16], "big"))
+
+
+def run_trials(task):
+    """Worker entry point: run a range of trials for one (p, flips) point.
+
+    A trial flips the coin `flips` times and counts as a detection when the
+    same chi-square test the GUI uses rejects fairness at level `alpha`.
+    Returns (p, flips, trials, detections, heads).
+    """
+    p, flips, first_trial, trials, alpha, seed = task
+    detections = 0
+    total_heads = 0
+    expected = flips / 2
+    for trial in range(first_trial, first_trial + trials):
+        heads = biased_bits(trial_rng(seed, p, flips, trial), flips, p).bit_count()
+        total_heads += heads
+        chi_square = ((heads - expected) ** 2 + (flips - heads - expected) ** 2) / expected
+        if chi_square_p_value(chi_square) < alpha:
+            detections += 1
+    return p, flips, trials, detections, total_heads
+
+
+class ExperimentResult:
+    """Merged detection counts for every (p, flips) point of a sweep."""
+
+    def __init__(self, biases, sample_sizes, alpha):
+        self.biases = list(biases)
+        self.sample_sizes = list(sample_sizes)
+        self.alpha = alpha
+        self.trials = {}
+        self.detections = {}
+        self.heads = {}
+        self.elapsed = 0.0
+
+    def add(self, p, flips, trials, detections, heads):
+        """Merge one worker's partial result."""
+        key = (p, flips)
+        self.trials[key] = self.trials.get(key, 0) + trials
+        self.detections[key] = self.detections.get(key, 0) + detections
+        self.heads[key] = self.heads.get(key, 0) + heads
+
+    def power(self, p, flips):
+        """Fraction of trials in which bias was detected."""
+        trials = self.trials.get((p, flips), 0)
+        return self.detections.get((p, flips), 0) / trials if trials else 0.0
+
+    def standard_error(self, p, flips):
+        trials = self.trials.get((p, flips), 0)
+        if not trials:
+            return 0.0
+        power = self.power(p, flips)
+        return math.sqrt(power * (1 - power) / trials)
+
+    def power_curves(self):
+        """{flips: [(p, power), ...]} for every sample size."""
+        return {flips: [(p, self.power(p, flips)) for p in self.biases] for flips in self.sample_sizes}
+
+    def table(self):
+        """Power table: one row per bias, one column per sample size."""
+        header = f"{'P(Heads)':>9} | " + " | ".join(f"{f'n={flips:,}':>11}" for flips in self.sample_sizes)
+        lines = [header, "-" * len(header)]
+        for p in self.biases:
+            cells = " | ".join(f"{self.power(p, flips):>11.3f}" for flips in self.sample_sizes)
+            lines.append(f"{p:>9.3f} | {cells}")
+        lines.append(f"Detection rate of the chi-square test at alpha = {self.alpha} "
+                     f"(the row for a fair coin is the false-positive rate)")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            "alpha": self.alpha,
+            "elapsed": self.elapsed,
+            "points": [
+                {"p": p, "flips": flips, "trials": self.trials.get((p, flips), 0),
+                 "detections": self.detections.get((p, flips), 0),
+                 "power": self.power(p, flips), "standard_error": self.standard_error(p, flips)}
+                for p in self.biases for flips in self.sample_sizes
+            ],
+        }
+
+
+def run_experiment(biases, sample_sizes, trials=1000, alpha=0.05, seed=0, workers=None):
+    """Run a bias x sample-size sweep across a process pool and merge the results.
+
+    Every (p, flips) point gets `trials` independent trials, split into tasks
+    of TRIALS_PER_TASK so all cores stay busy.
+    """
+    workers = workers or os.cpu_count() or 1
+    result = ExperimentResult(biases, sample_sizes, alpha)
+    tasks = [
+        (p, flips, start, min(TRIALS_PER_TASK, trials - start), alpha, seed)
+        for p in result.biases
+        for flips in result.sample_sizes
+        for start in range(0, trials, TRIALS_PER_TASK)
+    ]
+
+    start_time = time.perf_counter()
+    if workers == 1:
+        for task in tasks:
+            result.add(*run_trials(task))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for partial in pool.imap_unordered(run_trials, tasks):
+                result.add(*partial)
+    result.elapsed = time.perf_counter() - start_time
+    return result
+
+
+def _float_range(start, stop, step):
+    """Inclusive range of floats, rounded to avoid accumulation error."""
+    count = int(round((stop - start) / step)) + 1
+    return [round(start + i * step, 10) for i in range(count)]
+
+
+def main():
+    """Command-line entry point for parameter sweeps."""
+    parser = argparse.ArgumentParser(description="Measure how often the fairness check detects a biased coin.")
+    parser.add_argument("--p-min", type=float, default=0.45, help="lowest P(Heads) (default: 0.45)")
+    parser.add_argument("--p-max", type=float, default=0.55, help="highest P(Heads) (default: 0.55)")
+    parser.add_argument("--p-step", type=float, default=0.01, help="P(Heads) step (default: 0.01)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="flips per trial (default: 100 1000 10000)")
+    parser.add_argument("--trials", type=int, default=1000, help="trials per point (default: 1000)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="significance level (default: 0.05)")
+    parser.add_argument("--seed", type=int, default=0, help="experiment seed (default: 0)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    biases = _float_range(args.p_min, args.p_max, args.p_step)
+    result = run_experiment(biases, args.sizes, args.trials, args.alpha, args.seed, args.workers)
+    print(result.table())
+    total = sum(result.trials.values())
+    print(f"{total:,} trials in {result.elapsed:.2f}s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result.to_dict(), file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
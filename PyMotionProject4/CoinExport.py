@@ -0,0 +1,215 @@
+import sys
+import csv
+import io
+import gzip
+import json
+import struct
+import datetime
+import threading
+from array import array
+
+# Binary session format: header, then one bit per flip (bit 0 of byte 0 is the
+# first flip, 1 = Heads), then the flip timestamps as little-endian doubles.
+BINARY_MAGIC = b"COINTOS1"
+BINARY_HEADER = struct.Struct("<8sQB")
+
+# Flips rendered and written per write call
+CHUNK_SIZE = 65536
+
+EXPORT_FORMATS = ("markdown", "summary", "csv", "jsonl", "binary")
+
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def pack_outcomes(outcomes):
+    """Pack 0/1 outcomes into bytes, eight flips per byte."""
+    count = len(outcomes)
+    if not count:
+        return b""
+    # Outcomes become a string of binary digits, which int() parses in linear time
+    digits = bytes(outcomes).translate(_TO_DIGITS)[::-1]
+    return int(digits, 2).to_bytes((count + 7) // 8, "little")
+
+
+def unpack_outcomes(data, count):
+    """Inverse of `pack_outcomes`: return `count` outcomes as array('b')."""
+    if not count:
+        return array('b')
+    digits = format(int.from_bytes(data, "little"), f"0{count}b")[-count:][::-1]
+    return array('b', digits.encode("ascii").translate(_FROM_DIGITS))
+
+
+def format_flip(number, outcome, timestamp):
+    """Format one history entry the way the GUI shows it."""
+    result = "Heads" if outcome else "Tails"
+    moment = datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    return f"Flip #{number}: {result} ({moment})"
+
+
+def detect_format(path):
+    """Guess the export format from a file name."""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith(".jsonl"):
+        return "jsonl"
+    if name.endswith(".ctb"):
+        return "binary"
+    return "markdown"
+
+
+def _open_text(path):
+    """Open a text file for writing, gzip-compressed if the name ends with .gz."""
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    return open(path, "w", encoding="utf-8", newline="", buffering=1024 * 1024)
+
+
+def _write_summary(file, outcomes):
+    """Write the Markdown title and summary section."""
+    count = len(outcomes)
+    heads = bytes(outcomes).count(1)
+    file.write("# Virtual Coin Toss Results\n\n")
+    file.write("## Summary\n")
+    file.write(f"- Total flips: {count}\n")
+    if count > 0:
+        file.write(f"- Heads: {heads} ({(heads / count) * 100:.1f}%)\n")
+        file.write(f"- Tails: {count - heads} ({((count - heads) / count) * 100:.1f}%)\n")
+
+
+def export_session(path, outcomes, times=None, fmt=None):
+    """Write a session to `path` with buffered, chunked writes.
+
+    `outcomes` is a sequence of 0/1 flips and `times` the matching Unix
+    timestamps. Formats: "markdown" (summary and full history), "summary"
+    (Markdown summary only), "csv" and "jsonl" (gzip-compressed when the path
+    ends with .gz) and "binary" (bit-packed). Returns the path written.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose one of: {', '.join(EXPORT_FORMATS)}")
+    count = len(outcomes)
+    if times is not None and len(times) != count:
+        raise ValueError("outcomes and times must have the same length")
+
+    if fmt == "binary":
+        with open(path, "wb") as file:
+            file.write(BINARY_HEADER.pack(BINARY_MAGIC, count, 1 if times is not None else 0))
+            for start in range(0, count, CHUNK_SIZE * 8):
+                file.write(pack_outcomes(outcomes[start:start + CHUNK_SIZE * 8]))
+            if times is not None:
+                stamps = array('d', times)
+                if sys.byteorder == "big":
+                    stamps.byteswap()
+                stamps.tofile(file)
+        return path
+
+    with _open_text(path) as file:
+        if fmt in ("markdown", "summary"):
+            _write_summary(file, outcomes)
+            if fmt == "summary":
+                file.write(f"\n_Flip history omitted ({count} flips)._\n")
+                return path
+            file.write("\n## Complete History\n\n")
+        elif fmt == "csv":
+            file.write("flip,result,timestamp\n")
+
+        for start in range(0, count, CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, count)
+            if fmt == "markdown":
+                chunk = "".join(
+                    f"- {format_flip(i + 1, outcomes[i], times[i] if times is not None else 0)}\n"
+                    for i in range(start, stop))
+            elif fmt == "csv":
+                buffer = io.StringIO()
+                csv.writer(buffer, lineterminator="\n").writerows(
+                    (i + 1, "Heads" if outcomes[i] else "Tails", times[i] if times is not None else "")
+                    for i in range(start, stop))
+                chunk = buffer.getvalue()
+            else:
+                chunk = "".join(
+                    json.dumps({"flip": i + 1, "result": "Heads" if outcomes[i] else "Tails",
+                                "timestamp": times[i] if times is not None else None}) + "\n"
+                    for i in range(start, stop))
+            file.write(chunk)
+    return path
+
+
+def export_session_async(path, outcomes, times=None, fmt=None, on_done=None):
+    """Run `export_session` on a background thread.
+
+    The caller should pass copies of its arrays so the session can keep
+    changing while the export runs. `on_done(path, error)` is called from the
+    worker thread when the export finishes; error is None on success.
+    """
+    def worker():
+        try:
+            export_session(path, outcomes, times, fmt)
+        except Exception as e:
+            if on_done:
+                on_done(path, e)
+            return
+        if on_done:
+            on_done(path, None)
+
+    thread = threading.Thread(target=worker, name="coin-export", daemon=True)
+    thread.start()
+    return thread
+
+
+def _open_text_for_reading(path):
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def load_session(path):
+    """Restore a session written by `export_session`.
+
+    Returns (outcomes, times) as array('b') and array('d'); times is None for
+    binary exports written without them. Summary-only Markdown cannot be
+    restored.
+    """
+    with open(path, "rb") as file:
+        magic = file.read(len(BINARY_MAGIC))
+    if magic == BINARY_MAGIC:
+        with open(path, "rb") as file:
+            _, count, has_times = BINARY_HEADER.unpack(file.read(BINARY_HEADER.size))
+            outcomes = unpack_outcomes(file.read((count + 7) // 8), count)
+            times = None
+            if has_times:
+                times = array('d')
+                times.fromfile(file, count)
+                if sys.byteorder == "big":
+                    times.byteswap()
+        return outcomes, times
+
+    fmt = detect_format(path)
+    outcomes = array('b')
+    times = array('d')
+    with _open_text_for_reading(path) as file:
+        if fmt == "csv":
+            reader = csv.reader(file)
+            next(reader, None)
+            for _, result, timestamp in reader:
+                outcomes.append(1 if result == "Heads" else 0)
+                times.append(float(timestamp) if timestamp else 0.0)
+        elif fmt == "jsonl":
+            for line in file:
+                if line.strip():
+                    row = json.loads(line)
+                    outcomes.append(1 if row["result"] == "Heads" else 0)
+                    times.append(row["timestamp"] or 0.0)
+        else:
+            for line in file:
+                if line.startswith("_Flip history omitted"):
+                    raise ValueError("Summary-only exports do not contain the flip history")
+                if line.startswith("- Flip #"):
+                    entry = line[2:].rstrip("\n")
+                    outcomes.append(1 if ": Heads (" in entry else 0)
+                    moment = entry[entry.rindex("(") + 1:-1]
+                    times.append(datetime.datetime.strptime(moment, "%Y-%m-%d %H:%M:%S").timestamp())
+    return outcomes, times
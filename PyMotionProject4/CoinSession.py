@@ -0,0 +1,148 @@
+import random
+import time
+from array import array
+
+from CoinAnalytics import StreamingAnalytics
+from _profiling import timed, profile_count
+
+# CoinExport (and the csv/gzip/json/threading modules it needs) and
+# CoinSimulator are imported on first use, so importing the engine stays cheap.
+
+
+class CoinSession:
+    """Headless coin toss engine: state, statistics, batches and export.
+
+    Outcomes are kept as array('b') (1 = Heads, 0 = Tails) with Unix
+    timestamps in array('d'); counters and the streaming analytics make every
+    statistic O(1) per flip. Front ends such as the Tk GUI call `subscribe`
+    and are notified with an event name ("flip", "batch", "reset" or "load")
+    after each change. Nothing here touches a display.
+    """
+
+    def __init__(self, seed=None, rng=None, analytics=None):
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.analytics = analytics if analytics is not None else StreamingAnalytics()
+        self.listeners = []
+        self.outcomes = array('b')
+        self.times = array('d')
+        self.heads = 0
+
+    @property
+    def flip_count(self):
+        return len(self.outcomes)
+
+    @property
+    def tails(self):
+        return len(self.outcomes) - self.heads
+
+    def subscribe(self, listener):
+        """Call `listener(event)` after every change to the session."""
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def _notify(self, event):
+        for listener in self.listeners:
+            listener(event)
+
+    @timed()
+    def flip(self):
+        """Flip the coin once and return the outcome (1 = Heads, 0 = Tails)."""
+        outcome = self.rng.getrandbits(1)
+        self.outcomes.append(outcome)
+        self.times.append(time.time())
+        self.heads += outcome
+        self.analytics.update(outcome)
+        profile_count("flips")
+        self._notify("flip")
+        return outcome
+
+    @timed()
+    def flip_many(self, count):
+        """Flip the coin `count` times in one block and record every flip."""
+        if count <= 0:
+            return
+        import CoinExport
+
+        bits = self.rng.getrandbits(count)
+        self.outcomes.extend(CoinExport.unpack_outcomes(bits.to_bytes((count + 7) // 8, "little"), count))
+        self.times.extend(array('d', [time.time()]) * count)
+        self.heads += bits.bit_count()
+        self.analytics.update_bits(bits, count)
+        profile_count("flips", count)
+        self._notify("batch")
+
+    @timed()
+    def simulate(self, total, p=0.5, seed=None, analytics=None):
+        """Run a batch simulation that is not recorded in the session; return its result."""
+        from CoinSimulator import BatchSimulator
+
+        return BatchSimulator(p, seed, analytics=analytics).run(total)
+
+    def stats(self):
+        """Current statistics as a dictionary."""
+        flips = self.flip_count
+        runs = self.analytics.runs_test()
+        return {
+            "flips": flips,
+            "heads": self.heads,
+            "tails": self.tails,
+            "heads_percent": self.heads / flips * 100 if flips else 0.0,
+            "tails_percent": self.tails / flips * 100 if flips else 0.0,
+            "chi_square": self.analytics.chi_square(),
+            "p_value": self.analytics.chi_square_p_value(),
+            "runs_z": runs[0] if runs else None,
+            "runs_p_value": runs[1] if runs else None,
+            "longest_heads_streak": self.analytics.longest_streaks[1],
+            "longest_tails_streak": self.analytics.longest_streaks[0],
+            "sprt_decision": self.analytics.sprt_decision,
+        }
+
+    def format_flip(self, index):
+        """Format one history entry; strings are only built when asked for."""
+        import CoinExport
+
+        return CoinExport.format_flip(index + 1, self.outcomes[index], self.times[index])
+
+    def recent(self, count):
+        """Formatted entries for the last `count` flips."""
+        return [self.format_flip(index) for index in range(max(0, self.flip_count - count), self.flip_count)]
+
+    @timed()
+    def export(self, path, fmt=None):
+        """Write the session to `path` (format chosen from the extension by default)."""
+        import CoinExport
+
+        return CoinExport.export_session(path, self.outcomes, self.times, fmt)
+
+    def export_async(self, path, fmt=None, on_done=None):
+        """Export a snapshot of the session on a background thread."""
+        import CoinExport
+
+        return CoinExport.export_session_async(path, self.outcomes[:], self.times[:], fmt, on_done)
+
+    @timed()
+    def load(self, path):
+        """Replace the session with the flips stored in an export."""
+        import CoinExport
+
+        outcomes, times = CoinExport.load_session(path)
+        self._clear()
+        self.outcomes = outcomes
+        self.times = times if times is not None else array('d', [0.0]) * len(outcomes)
+        self.heads = bytes(outcomes).count(1)
+        if outcomes:
+            self.analytics.update_bits(int.from_bytes(CoinExport.pack_outcomes(outcomes), "little"), len(outcomes))
+        self._notify("load")
+
+    def _clear(self):
+        self.outcomes = array('b')
+        self.times = array('d')
+        self.heads = 0
+        self.analytics.reset()
+
+    def reset(self):
+        """Forget every flip."""
+        self._clear()
+        self._notify("reset")
@@ -0,0 +1,201 @@
+import random
+import time
+
+# Flips simulated per block. Each block is one big integer of random bits
+# (1 = Heads, bit 0 = first flip), so counting and run detection are done
+# by a handful of whole-block integer operations instead of a Python loop.
+DEFAULT_BLOCK_SIZE = 1 << 22
+
+# Bits of precision used to approximate a biased coin's probability
+BIAS_PRECISION = 32
+
+
+def _longest_run(bits):
+    """Length of the longest run of set bits in a non-negative integer."""
+    run = 0
+    while bits:
+        bits &= bits >> 1
+        run += 1
+    return run
+
+
+def _leading_run(bits, size):
+    """Length of the run of set bits starting at bit 0."""
+    if bits == (1 << size) - 1:
+        return size
+    return (bits ^ (bits + 1)).bit_length() - 1
+
+
+def _trailing_run(bits, size):
+    """Length of the run of set bits ending at bit `size - 1`."""
+    return size - ((~bits) & ((1 << size) - 1)).bit_length()
+
+
+def biased_bits(rng, size, p):
+    """Return `size` random bits where each bit is 1 with probability `p`.
+
+    `p` is rounded to BIAS_PRECISION binary digits. Walking those digits from
+    the least significant one, each step either ORs or ANDs in a fresh block
+    of fair bits, which gives exactly that probability per bit.
+    """
+    if p == 0.5:
+        return rng.getrandbits(size)
+    scaled = round(p * (1 << BIAS_PRECISION))
+    if scaled <= 0:
+        return 0
+    if scaled >= 1 << BIAS_PRECISION:
+        return (1 << size) - 1
+    bits = 0
+    for position in range(BIAS_PRECISION):
+        if (scaled >> position) & 1:
+            bits |= rng.getrandbits(size)
+        else:
+            bits &= rng.getrandbits(size)
+    return bits
+
+
+class SimulationResult:
+    """Aggregated outcome of a batch simulation."""
+
+    def __init__(self, flips, heads, longest_heads_run, longest_tails_run, elapsed):
+        self.flips = flips
+        self.heads = heads
+        self.tails = flips - heads
+        self.longest_heads_run = longest_heads_run
+        self.longest_tails_run = longest_tails_run
+        self.elapsed = elapsed
+
+    @property
+    def chi_square(self):
+        """Chi-square statistic of the heads/tails counts against a fair coin."""
+        if not self.flips:
+            return 0.0
+        expected = self.flips / 2
+        return ((self.heads - expected) ** 2 + (self.tails - expected) ** 2) / expected
+
+    @property
+    def flips_per_second(self):
+        return self.flips / self.elapsed if self.elapsed else float("inf")
+
+    def summary(self):
+        """Multi-line, human readable description of the result."""
+        if not self.flips:
+            return "No flips simulated."
+        return (
+            f"Simulated {self.flips:,} flips in {self.elapsed:.2f}s ({self.flips_per_second / 1e6:,.0f}M flips/s)\n"
+            f"Heads: {self.heads:,} ({self.heads / self.flips * 100:.4f}%)  "
+            f"Tails: {self.tails:,} ({self.tails / self.flips * 100:.4f}%)\n"
+            f"Chi² = {self.chi_square:.2f}  Longest runs: Heads {self.longest_heads_run}, "
+            f"Tails {self.longest_tails_run}"
+        )
+
+
+class BatchSimulator:
+    """Simulates coin flips in large blocks without storing individual flips.
+
+    Counts, longest runs (including runs crossing block boundaries) and the
+    chi-square statistic are aggregated block by block, so memory stays
+    constant however many flips are simulated. An optional `analytics`
+    object (see CoinAnalytics.StreamingAnalytics) receives every block.
+    """
+
+    def __init__(self, p=0.5, seed=None, block_size=DEFAULT_BLOCK_SIZE, rng=None, analytics=None):
+        if not 0 <= p <= 1:
+            raise ValueError("p must be between 0 and 1")
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.p = p
+        self.block_size = block_size
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.analytics = analytics
+        self.reset()
+
+    def reset(self):
+        """Forget all aggregated statistics."""
+        self.flips = 0
+        self.heads = 0
+        self.longest_runs = [0, 0]  # indexed by outcome: [Tails, Heads]
+        self.run_value = None
+        self.run_length = 0
+        self.elapsed = 0.0
+
+    def run_block(self, size):
+        """Simulate `size` flips, fold them into the totals and return the raw bits."""
+        start = time.perf_counter()
+        bits = biased_bits(self.rng, size, self.p)
+        inverted = ~bits & ((1 << size) - 1)
+
+        self.heads += bits.bit_count()
+        self.flips += size
+        self.longest_runs[1] = max(self.longest_runs[1], _longest_run(bits))
+        self.longest_runs[0] = max(self.longest_runs[0], _longest_run(inverted))
+
+        # Join the run carried over from the previous block with this block's first run
+        first_value = bits & 1
+        first_run = _leading_run(bits if first_value else inverted, size)
+        if first_value == self.run_value:
+            joined = self.run_length + first_run
+            self.longest_runs[first_value] = max(self.longest_runs[first_value], joined)
+        else:
+            joined = first_run
+        if first_run == size:
+            self.run_value, self.run_length = first_value, joined
+        else:
+            last_value = (bits >> (size - 1)) & 1
+            self.run_value = last_value
+            self.run_length = _trailing_run(bits if last_value else inverted, size)
+
+        if self.analytics is not None:
+            self.analytics.update_bits(bits, size)
+        self.elapsed += time.perf_counter() - start
+        return bits
+
+    def iter_run(self, total):
+        """Simulate `total` flips, yielding the number of flips done after each block."""
+        done = 0
+        while done < total:
+            size = min(self.block_size, total - done)
+            self.run_block(size)
+            done += size
+            yield done
+
+    def run(self, total):
+        """Simulate `total` flips and return the aggregated `SimulationResult`."""
+        for _ in self.iter_run(total):
+            pass
+        return self.result()
+
+    def result(self):
+        """Snapshot of the statistics aggregated so far."""
+        return SimulationResult(self.flips, self.heads, self.longest_runs[1], self.longest_runs[0], self.elapsed)
+
+
+def simulate(total, p=0.5, seed=None, block_size=DEFAULT_BLOCK_SIZE, analytics=None):
+    """Simulate `total` coin flips headlessly and return a `SimulationResult`."""
+    return BatchSimulator(p, seed, block_size, analytics=analytics).run(total)
+
+
+def main():
+    """Command-line entry point for headless simulations."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate large numbers of coin flips.")
+    parser.add_argument("flips", type=int, help="number of flips to simulate")
+    parser.add_argument("-p", type=float, default=0.5, help="probability of heads (default: 0.5)")
+    parser.add_argument("--seed", type=int, help="seed for reproducible runs")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="flips per block")
+    parser.add_argument("--analytics", action="store_true",
+                        help="also run the runs test, autocorrelation and SPRT")
+    args = parser.parse_args()
+
+    analytics = None
+    if args.analytics:
+        from CoinAnalytics import StreamingAnalytics
+        analytics = StreamingAnalytics()
+    print(simulate(args.flips, args.p, args.seed, args.block_size, analytics).summary())
+    if analytics is not None:
+        print(analytics.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,177 +1,306 @@
 import tkinter as tk
-import random
-import datetime
-import math
-from tkinter import scrolledtext
+from tkinter import scrolledtext, filedialog
+from CoinSession import CoinSession
+from CoinAnalytics import StreamingAnalytics
+from CoinSimulator import BatchSimulator
+from _profiling import timed
 
 # Symbols for heads, tails, and coin flip
-HEADS_SYMBOL = "₿" 
-TAILS_SYMBOL ="🏚"  
+HEADS_SYMBOL = "₿"
+TAILS_SYMBOL ="🏚"
 COIN_SYMBOL = "🟡"
 
-# Global variables
-flip_history = []
-flip_count = 0
-
-# Function to flip the coin
-def flip_coin():
-    global flip_count
-    flip_count += 1
-    result = random.choice(["Heads", "Tails"])
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    flip_history.append(f"Flip #{flip_count}: {result} ({timestamp})")
-    
-    # Update GUI
-    if result == "Heads":
-        coin_label.config(text=HEADS_SYMBOL)
-    else:
-        coin_label.config(text=TAILS_SYMBOL)
-    result_label.config(text=result)
-    count_label.config(text=f"Flip #{flip_count}")
-    
+# Number of flips kept in the history box, and how long display updates are
+# coalesced for (about one frame), so rapid flipping never queues up redraws
+HISTORY_LIMIT = 20
+RENDER_DELAY_MS = 16
+
+# Export choices shown in the GUI: label -> (file name, format)
+EXPORT_CHOICES = {
+    "Markdown (full)": ("TossResult.md", "markdown"),
+    "Markdown (summary)": ("TossResult.md", "summary"),
+    "CSV (gzip)": ("TossResult.csv.gz", "csv"),
+    "JSONL (gzip)": ("TossResult.jsonl.gz", "jsonl"),
+    "Binary": ("TossResult.ctb", "binary"),
+}
+
+
+class CoinTossApp:
+    """Tk front end for a CoinSession. All coin logic lives in the session;
+    the window subscribes to it and redraws at most once per frame."""
+
+    def __init__(self, root, session=None):
+        self.root = root
+        self.session = session if session is not None else CoinSession()
+        self.history_rendered = 0   # flips already drawn into the history box
+        self.history_lines = 0      # lines currently in the history box
+        self.render_pending = False
+        self.build_widgets()
+        self.session.subscribe(self.on_session_event)
+
+    # Create every widget of the window
+    def build_widgets(self):
+        root = self.root
+        root.title("Virtual Coin Toss")
+        root.geometry("500x940")
+        root.resizable(False, False)
+
+        # Create tabs
+        tab_control = tk.Frame(root)
+        tab_control.pack(fill="both", expand=True)
+
+        # Main frame
+        main_frame = tk.Frame(tab_control)
+        main_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        # Heading
+        tk.Label(main_frame, text="Virtual Coin Toss", font=("Arial", 18, "bold")).pack(pady=10)
+        tk.Label(main_frame, text="Click the button to flip!", font=("Arial", 12)).pack()
+
+        # Coin display
+        self.coin_label = tk.Label(main_frame, text=COIN_SYMBOL, font=("Arial", 40))
+        self.coin_label.pack(pady=15)
+
+        # Flip result display
+        self.result_label = tk.Label(main_frame, text="Waiting for results...", font=("Arial", 14, "bold"))
+        self.result_label.pack()
+        self.count_label = tk.Label(main_frame, text="", font=("Arial", 12))
+        self.count_label.pack()
+
+        # Statistics display
+        stats_frame = tk.Frame(main_frame)
+        stats_frame.pack(pady=10, fill="x")
+
+        self.heads_label = tk.Label(stats_frame, text=f"{HEADS_SYMBOL} Heads: 0 (0%)", font=("Arial", 12))
+        self.heads_label.pack(side=tk.LEFT, padx=20)
+
+        self.tails_label = tk.Label(stats_frame, text=f"{TAILS_SYMBOL} Tails: 0 (0%)", font=("Arial", 12))
+        self.tails_label.pack(side=tk.RIGHT, padx=20)
+
+        # Fairness indicator
+        self.fairness_label = tk.Label(main_frame, text="", font=("Arial", 11, "italic"))
+        self.fairness_label.pack(pady=5)
+        self.analytics_label = tk.Label(main_frame, text="", font=("Arial", 9), justify=tk.LEFT)
+        self.analytics_label.pack()
+
+        # History area
+        tk.Label(main_frame, text="Recent Flip History", font=("Arial", 12, "bold")).pack(pady=(10, 5))
+        self.history_text = scrolledtext.ScrolledText(main_frame, width=50, height=10, wrap=tk.WORD)
+        self.history_text.pack(padx=10, pady=5)
+        self.history_text.config(state=tk.DISABLED)
+
+        # Buttons frame
+        button_frame = tk.Frame(main_frame)
+        button_frame.pack(pady=10)
+
+        self.flip_button = tk.Button(button_frame, text="Flip Coin", command=self.flip_coin, font=("Arial", 12), width=12)
+        self.flip_button.pack(side=tk.LEFT, padx=5)
+
+        self.reset_button = tk.Button(button_frame, text="Reset", command=self.session.reset, font=("Arial", 12), width=12)
+        self.reset_button.pack(side=tk.LEFT, padx=5)
+
+        self.export_button = tk.Button(button_frame, text="Export", command=self.export_results, font=("Arial", 12), width=12)
+        self.export_button.pack(side=tk.LEFT, padx=5)
+
+        # Export format and session loading
+        export_frame = tk.Frame(main_frame)
+        export_frame.pack()
+        tk.Label(export_frame, text="Export as:", font=("Arial", 11)).pack(side=tk.LEFT)
+        self.export_choice = tk.StringVar(value="Markdown (full)")
+        tk.OptionMenu(export_frame, self.export_choice, *EXPORT_CHOICES).pack(side=tk.LEFT, padx=5)
+        self.load_button = tk.Button(export_frame, text="Load Session", command=self.load_results, font=("Arial", 11))
+        self.load_button.pack(side=tk.LEFT, padx=5)
+
+        # Export result message
+        self.export_label = tk.Label(main_frame, text="", font=("Arial", 10, "italic"), fg="green")
+        self.export_label.pack()
+
+        # Batch simulation
+        simulate_frame = tk.Frame(main_frame)
+        simulate_frame.pack(pady=(10, 0))
+        tk.Label(simulate_frame, text="Simulate flips:", font=("Arial", 11)).pack(side=tk.LEFT)
+        self.simulate_entry = tk.Entry(simulate_frame, width=14)
+        self.simulate_entry.insert(0, "10000000")
+        self.simulate_entry.pack(side=tk.LEFT, padx=5)
+        self.simulate_button = tk.Button(simulate_frame, text="Simulate", command=self.run_simulation, font=("Arial", 11))
+        self.simulate_button.pack(side=tk.LEFT)
+        self.simulate_label = tk.Label(main_frame, text="", font=("Arial", 9), justify=tk.LEFT)
+        self.simulate_label.pack(pady=5)
+
+    # Flip the coin; the session notifies us and the display catches up
+    @timed()
+    def flip_coin(self):
+        self.session.flip()
+
+    # React to changes in the session
+    def on_session_event(self, event):
+        if event in ("reset", "load"):
+            self.clear_display()
+        if event != "reset":
+            self.schedule_render()
+
+    # Schedule a single display refresh
+    def schedule_render(self):
+        if not self.render_pending:
+            self.render_pending = True
+            self.root.after(RENDER_DELAY_MS, self.render_display)
+
+    # Bring every widget up to date with the latest flip
+    @timed()
+    def render_display(self):
+        self.render_pending = False
+        session = self.session
+        if session.flip_count == 0:
+            return
+
+        if session.outcomes[-1]:
+            self.coin_label.config(text=HEADS_SYMBOL)
+            self.result_label.config(text="Heads")
+        else:
+            self.coin_label.config(text=TAILS_SYMBOL)
+            self.result_label.config(text="Tails")
+        self.count_label.config(text=f"Flip #{session.flip_count}")
+
+        # Update statistics
+        self.update_statistics()
+
+        # Update the history display
+        self.update_history_display()
+
+        # Check if coin is fair when we have enough flips
+        self.check_fairness()
+
     # Update statistics
-    update_statistics()
-    
+    def update_statistics(self):
+        flips = self.session.flip_count
+        if flips > 0:
+            heads, tails = self.session.heads, self.session.tails
+            self.heads_label.config(text=f"{HEADS_SYMBOL} Heads: {heads} ({(heads/flips)*100:.1f}%)")
+            self.tails_label.config(text=f"{TAILS_SYMBOL} Tails: {tails} ({(tails/flips)*100:.1f}%)")
+
     # Update the history display
-    update_history_display()
-    
-    # Check if coin is fair when we have enough flips
-    check_fairness()
-
-# Function to update statistics
-def update_statistics():
-    heads_count = sum(1 for flip in flip_history if "Heads" in flip)
-    tails_count = sum(1 for flip in flip_history if "Tails" in flip)
-    
-    if flip_count > 0:
-        heads_label.config(text=f"{HEADS_SYMBOL} Heads: {heads_count} ({(heads_count/flip_count)*100:.1f}%)")
-        tails_label.config(text=f"{TAILS_SYMBOL} Tails: {tails_count} ({(tails_count/flip_count)*100:.1f}%)")
-
-# Function to update the history display
-def update_history_display():
-    history_text.config(state=tk.NORMAL)
-    history_text.delete(1.0, tk.END)
-    for entry in flip_history[-20:]:  # Show only the latest 20 flips to avoid clutter
-        history_text.insert(tk.END, f"{entry}\n")
-    history_text.config(state=tk.DISABLED)
-    history_text.see(tk.END)  # Scroll to the end
-
-# Function to check if the coin is fair
-def check_fairness():
-    if flip_count < 10:
-        fairness_label.config(text="Need at least 10 flips to check fairness", fg="black")
-        return
-    
-    heads_count = sum(1 for flip in flip_history if "Heads" in flip)
-    expected = flip_count / 2
-    
-    # Chi-square test for fairness
-    chi_square = ((heads_count - expected) ** 2) / expected + ((flip_count - heads_count - expected) ** 2) / expected
-    
-    # Critical value for chi-square with 1 degree of freedom at 95% confidence level is 3.84
-    if chi_square < 3.84:
-        fairness_label.config(text=f"Coin appears fair (Chi² = {chi_square:.2f})", fg="green")
-    else:
-        fairness_label.config(text=f"Coin may be biased (Chi² = {chi_square:.2f})", fg="red")
-
-# Function to export results to tossresult.md
-def export_results():
-    with open("tossresult.md", "w", encoding="utf-8") as file:
-        file.write("# Virtual Coin Toss Results\n\n")
-        file.write(f"## Summary\n")
-        heads_count = sum(1 for flip in flip_history if "Heads" in flip)
-        tails_count = sum(1 for flip in flip_history if "Tails" in flip)
-        
-        file.write(f"- Total flips: {flip_count}\n")
-        if flip_count > 0:
-            file.write(f"- Heads: {heads_count} ({(heads_count/flip_count)*100:.1f}%)\n")
-            file.write(f"- Tails: {tails_count} ({(tails_count/flip_count)*100:.1f}%)\n")
-        
-        file.write(f"\n## Complete History\n\n")
-        for entry in flip_history:
-            file.write(f"- {entry}\n")
-    export_label.config(text="Results exported to TossResult.md")
-
-# Function to reset the game
-def reset_game():
-    global flip_history, flip_count
-    flip_history = []
-    flip_count = 0
-    coin_label.config(text=COIN_SYMBOL)
-    result_label.config(text="Waiting for results...")
-    count_label.config(text="")
-    heads_label.config(text=f"{HEADS_SYMBOL} Heads: 0 (0%)")
-    tails_label.config(text=f"{TAILS_SYMBOL} Tails: 0 (0%)")
-    export_label.config(text="")
-    fairness_label.config(text="")
-    history_text.config(state=tk.NORMAL)
-    history_text.delete(1.0, tk.END)
-    history_text.config(state=tk.DISABLED)
-
-# Create GUI window
-root = tk.Tk()
-root.title("Virtual Coin Toss")
-root.geometry("500x650")
-root.resizable(False, False)
-
-# Create tabs
-tab_control = tk.Frame(root)
-tab_control.pack(fill="both", expand=True)
-
-# Main frame
-main_frame = tk.Frame(tab_control)
-main_frame.pack(fill="both", expand=True, padx=10, pady=5)
-
-# Heading
-tk.Label(main_frame, text="Virtual Coin Toss", font=("Arial", 18, "bold")).pack(pady=10)
-tk.Label(main_frame, text="Click the button to flip!", font=("Arial", 12)).pack()
-
-# Coin display
-coin_label = tk.Label(main_frame, text=COIN_SYMBOL, font=("Arial", 40))
-coin_label.pack(pady=15)
-
-# Flip result display
-result_label = tk.Label(main_frame, text="Waiting for results...", font=("Arial", 14, "bold"))
-result_label.pack()
-count_label = tk.Label(main_frame, text="", font=("Arial", 12))
-count_label.pack()
-
-# Statistics display
-stats_frame = tk.Frame(main_frame)
-stats_frame.pack(pady=10, fill="x")
-
-heads_label = tk.Label(stats_frame, text=f"{HEADS_SYMBOL} Heads: 0 (0%)", font=("Arial", 12))
-heads_label.pack(side=tk.LEFT, padx=20)
-
-tails_label = tk.Label(stats_frame, text=f"{TAILS_SYMBOL} Tails: 0 (0%)", font=("Arial", 12))
-tails_label.pack(side=tk.RIGHT, padx=20)
-
-# Fairness indicator
-fairness_label = tk.Label(main_frame, text="", font=("Arial", 11, "italic"))
-fairness_label.pack(pady=5)
-
-# History area
-tk.Label(main_frame, text="Recent Flip History", font=("Arial", 12, "bold")).pack(pady=(10, 5))
-history_text = scrolledtext.ScrolledText(main_frame, width=50, height=10, wrap=tk.WORD)
-history_text.pack(padx=10, pady=5)
-history_text.config(state=tk.DISABLED)
-
-# Buttons frame
-button_frame = tk.Frame(main_frame)
-button_frame.pack(pady=10)
-
-flip_button = tk.Button(button_frame, text="Flip Coin", command=flip_coin, font=("Arial", 12), width=12)
-flip_button.pack(side=tk.LEFT, padx=5)
-
-reset_button = tk.Button(button_frame, text="Reset", command=reset_game, font=("Arial", 12), width=12)
-reset_button.pack(side=tk.LEFT, padx=5)
-
-export_button = tk.Button(button_frame, text="Export", command=export_results, font=("Arial", 12), width=12)
-export_button.pack(side=tk.LEFT, padx=5)
-
-# Export result message
-export_label = tk.Label(main_frame, text="", font=("Arial", 10, "italic"), fg="green")
-export_label.pack()
-
-# Run the GUI
-root.mainloop()
\ No newline at end of file
+    def update_history_display(self):
+        flips = self.session.flip_count
+        # Only append flips not drawn yet (at most a screenful) and trim the oldest lines
+        first = max(self.history_rendered, flips - HISTORY_LIMIT)
+        if first >= flips:
+            return
+        new_lines = "".join(f"{self.session.format_flip(index)}\n" for index in range(first, flips))
+        self.history_text.config(state=tk.NORMAL)
+        self.history_text.insert(tk.END, new_lines)
+        self.history_lines += flips - first
+        if self.history_lines > HISTORY_LIMIT:  # Show only the latest flips to avoid clutter
+            self.history_text.delete("1.0", f"{self.history_lines - HISTORY_LIMIT + 1}.0")
+            self.history_lines = HISTORY_LIMIT
+        self.history_text.config(state=tk.DISABLED)
+        self.history_text.see(tk.END)  # Scroll to the end
+        self.history_rendered = flips
+
+    # Check if the coin is fair
+    def check_fairness(self):
+        if self.session.flip_count < 10:
+            self.fairness_label.config(text="Need at least 10 flips to check fairness", fg="black")
+            return
+
+        # Chi-square test for fairness, kept up to date by the analytics engine
+        analytics = self.session.analytics
+        chi_square = analytics.chi_square()
+        p_value = analytics.chi_square_p_value()
+
+        # Significant at the 95% confidence level
+        if p_value >= 0.05:
+            self.fairness_label.config(text=f"Coin appears fair (Chi² = {chi_square:.2f}, p = {p_value:.3f})", fg="green")
+        else:
+            self.fairness_label.config(text=f"Coin may be biased (Chi² = {chi_square:.2f}, p = {p_value:.3f})", fg="red")
+        self.analytics_label.config(text=analytics.summary())
+
+    # Export results in the chosen format on a background thread
+    def export_results(self):
+        filename, fmt = EXPORT_CHOICES[self.export_choice.get()]
+        finished = []
+
+        # The session exports a snapshot, so flipping can continue meanwhile
+        self.session.export_async(filename, fmt, on_done=lambda path, error: finished.append(error))
+        self.export_button.config(state=tk.DISABLED)
+        self.export_label.config(text=f"Exporting to {filename}...", fg="black")
+
+        # Tk must only be touched from the main thread, so poll for completion
+        def check_done():
+            if not finished:
+                self.root.after(50, check_done)
+                return
+            self.export_button.config(state=tk.NORMAL)
+            if finished[0] is None:
+                self.export_label.config(text=f"Results exported to {filename}", fg="green")
+            else:
+                self.export_label.config(text=f"Export failed: {finished[0]}", fg="red")
+
+        check_done()
+
+    # Restore a session from an exported file
+    @timed()
+    def load_results(self):
+        path = filedialog.askopenfilename(filetypes=[
+            ("Coin toss exports", "*.ctb *.csv *.csv.gz *.jsonl *.jsonl.gz *.md"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            self.session.load(path)
+        except (OSError, ValueError) as e:
+            self.export_label.config(text=f"Load failed: {e}", fg="red")
+            return
+        self.export_label.config(text=f"Loaded {self.session.flip_count:,} flips from {path}", fg="green")
+
+    # Run a batch simulation without blocking the window
+    def run_simulation(self):
+        try:
+            total = int(self.simulate_entry.get().replace(",", "").replace("_", ""))
+            if total <= 0:
+                raise ValueError
+        except ValueError:
+            self.simulate_label.config(text="Enter a positive number of flips", fg="red")
+            return
+
+        simulation_analytics = StreamingAnalytics()
+        simulator = BatchSimulator(analytics=simulation_analytics)
+        progress = simulator.iter_run(total)
+        self.simulate_button.config(state=tk.DISABLED)
+
+        # One block per event-loop turn keeps the GUI responsive
+        def step():
+            done = next(progress, None)
+            if done is None:
+                self.simulate_label.config(text=f"{simulator.result().summary()}\n{simulation_analytics.summary()}", fg="black")
+                self.simulate_button.config(state=tk.NORMAL)
+                return
+            self.simulate_label.config(text=f"Simulating... {done:,} / {total:,} flips", fg="black")
+            self.root.after(1, step)
+
+        step()
+
+    # Reset every widget to its initial state
+    def clear_display(self):
+        self.history_rendered = 0
+        self.history_lines = 0
+        self.coin_label.config(text=COIN_SYMBOL)
+        self.result_label.config(text="Waiting for results...")
+        self.count_label.config(text="")
+        self.heads_label.config(text=f"{HEADS_SYMBOL} Heads: 0 (0%)")
+        self.tails_label.config(text=f"{TAILS_SYMBOL} Tails: 0 (0%)")
+        self.export_label.config(text="")
+        self.fairness_label.config(text="")
+        self.analytics_label.config(text="")
+        self.history_text.config(state=tk.NORMAL)
+        self.history_text.delete(1.0, tk.END)
+        self.history_text.config(state=tk.DISABLED)
+
+
+# Create the GUI window and run it
+def main():
+    root = tk.Tk()
+    CoinTossApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
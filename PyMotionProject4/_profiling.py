@@ -0,0 +1,22 @@
+"""Optional hooks into the shared profiler (PyMotionProfiler.py in the repository root).
+
+The profiler is used when it can be imported, i.e. when the repository
+root is on PYTHONPATH:
+
+    PYTHONPATH=.. PYMOTION_PROFILE=1 python <app>.py
+
+Otherwise `timed`, `span` and `profile_count` are do-nothing stand-ins, so
+the app runs on its own. Nothing here changes sys.path.
+"""
+try:
+    from PyMotionProfiler import timed, span, count as profile_count
+except ImportError:
+    from contextlib import nullcontext as span
+
+    def timed(name=None):
+        return lambda function: function
+
+    def profile_count(name, amount=1):
+        pass
+
+__all__ = ["timed", "span", "profile_count"]
@@ -1,9 +1,495 @@
+import io
+import os
+import re
+import sys
+import bisect
+import functools
+import shutil
+import fnmatch
+import argparse
+import tempfile
+import threading
+import multiprocessing
+import unicodedata
+
+from _profiling import timed, span, profile_count
+
+# Bytes read per step when streaming files
+BLOCK_SIZE = 1 << 20
+
+# Grapheme cluster rules (a practical subset of Unicode UAX #29): CRLF pairs,
+# regional indicator pairs (flags), Hangul jamo sequences, and any character
+# followed by extending characters or joined by a zero width joiner
+ZWJ = "\u200d"
+REGIONAL_INDICATORS = "\U0001F1E6-\U0001F1FF"
+HANGUL_L = "\u1100-\u115F\uA960-\uA97C"
+HANGUL_V = "\u1160-\u11A7\uD7B0-\uD7C6"
+HANGUL_T = "\u11A8-\u11FF\uD7CB-\uD7FB"
+HANGUL_SYLLABLES = "\uAC00-\uD7A3"
+# Extending characters beyond the combining mark categories: zero width
+# non-joiner and joiner, emoji skin tones, and emoji tag characters
+EXTRA_EXTENDERS = ((0x200C, 0x200D), (0x1F3FB, 0x1F3FF), (0xE0020, 0xE007F))
+MARK_CATEGORIES = ("Mn", "Mc", "Me")
+
+def _ranges_to_class(ranges):
+    """Turn (first, last) code point ranges into the body of a regex character class."""
+    return "".join(re.escape(chr(first)) if first == last else f"{re.escape(chr(first))}-{re.escape(chr(last))}"
+                   for first, last in ranges)
+
+@functools.lru_cache(maxsize=None)
+def _grapheme_tables():
+    """Build the grapheme regexes once per process, on the first non-ASCII text.
+
+    Returns (special_split, cluster_or_char, safe_boundary):
+    special_split splits text around each character that may take part in a
+    multi-character cluster. Its character class is BMP-only plus a single
+    range for everything beyond the BMP, so the regex engine checks it with a
+    bitmap lookup per character. cluster_or_char matches one cluster at a
+    time, and safe_boundary finds a character that always starts a new
+    cluster whatever came before it.
+    """
+    ranges = []
+    for code in range(0x300, sys.maxunicode + 1):
+        if unicodedata.category(chr(code)) in MARK_CATEGORIES:
+            if ranges and ranges[-1][1] == code - 1:
+                ranges[-1] = (ranges[-1][0], code)
+            else:
+                ranges.append((code, code))
+    ranges += EXTRA_EXTENDERS
+    extend = _ranges_to_class(ranges)
+    L, V, T, LV = HANGUL_L, HANGUL_V, HANGUL_T, HANGUL_SYLLABLES
+    hangul = (f"[{L}]+[{LV}{V}][{V}]*[{T}]*|[{L}]{{2,}}|[{LV}](?:[{V}]+[{T}]*|[{T}]+)"
+              f"|[{V}](?:[{V}]+[{T}]*|[{T}]+)|[{T}]{{2,}}")
+    attached = f"(?:{ZWJ}[^\\r\\n]|[{extend}])"
+    cluster = (f"\\r\\n|[{REGIONAL_INDICATORS}]{{2}}|(?:{hangul}){attached}*"
+               f"|[^\\r\\n]{attached}+")
+    # Beyond the BMP, marks only occur in the historic-script planes and the
+    # variation selector supplement, so a few coarse ranges cover them all
+    special = (_ranges_to_class([r for r in ranges if r[1] <= 0xFFFF])
+               + f"{L}{V}{T}{REGIONAL_INDICATORS}\\r\\U00010000-\\U0001EFFF\\U0001F3FB-\\U0001F3FF"
+                 "\\U000E0000-\\U000E0FFF")
+    # "\n" only continues a cluster right after "\r"
+    nonstarters = f"{extend}{REGIONAL_INDICATORS}{L}{V}{T}{LV}\\n"
+    return (re.compile(f"([{special}])"),
+            re.compile(f"{cluster}|.", re.S),
+            re.compile(f"(?<!{ZWJ})[^{nonstarters}]|(?<!\\r)\\n"))
+
+# Longest start of a block carried over to the block before it, in characters
+CARRY_LIMIT = 1 << 16
+
+# Reversed special-character windows, shared by every call in the process
+WINDOW_CACHE_SIZE = 4096
+_window_cache = {}
+
+def _joins_next(char):
+    """True if a cluster ending in `char` may continue with any character after it."""
+    return char in "\r\u200d" or "\u1100" <= char <= "\u115f" or "\ua960" <= char <= "\ua97c"
+
+def _is_latin1(text):
+    """True if every character of `text` is below U+0100 (a one-byte-per-character string)."""
+    try:
+        text.encode("latin-1")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+def split_graphemes(text):
+    """Split text into user-perceived characters (base + marks, ZWJ sequences, flags, CRLF)."""
+    if text.isascii() and "\r" not in text:
+        return list(text)
+    return _grapheme_tables()[1].findall(text)
+
+def _attached_prefix_length(text):
+    """Length of the start of a text block that may belong to a cluster in the text before it.
+
+    Everything up to the first character that is certain to start a new
+    cluster (and is not at position 0) is included.
+    """
+    if len(text) > 1 and text[1] < "\x80" and text[0] != ZWJ and (text[1] != "\n" or text[0] != "\r"):
+        return 1
+    boundary = _grapheme_tables()[2].search(text, 1)
+    return boundary.start() if boundary else len(text)
+
+def reverse_graphemes(text):
+    """Reverse text without splitting combining marks, emoji sequences, flags or CRLF pairs.
+
+    Pure ASCII and Latin-1 text is reversed by slicing. Other text is split around runs
+    of special characters; the plain runs between them hold one character
+    per cluster and are reversed by slicing too, so only the short windows
+    around special characters are segmented cluster by cluster.
+    """
+    if text.isascii() or _is_latin1(text):
+        # Plain slicing is exact for ASCII and Latin-1 (which have no combining
+        # marks) apart from keeping CRLF pairs in order
+        if "\r" not in text:
+            return text[::-1]
+        return "\r\n".join(part[::-1] for part in reversed(text.split("\r\n")))
+    special, clusters, _ = _grapheme_tables()
+    parts = special.split(text)
+    if len(parts) == 1:
+        return text[::-1]
+
+    # Even entries of `parts` are plain runs, odd entries special characters.
+    # Each window is a run of special characters plus the base character
+    # before it (and the character after it when the run ends in CR, ZWJ or a
+    # Hangul lead jamo). The same few windows (an emoji after a letter, an
+    # accent) recur throughout a text, so their reversals are cached.
+    cache = _window_cache
+    pieces = []
+    window = ""
+    for index in range(0, len(parts), 2):
+        plain = parts[index]
+        if window and plain and _joins_next(window[-1]):
+            window, plain = window + plain[0], plain[1:]
+        last = index + 1 == len(parts)
+        if plain or last:
+            if window:
+                reversed_window = cache.get(window)
+                if reversed_window is None:
+                    reversed_window = "".join(reversed(clusters.findall(window)))
+                    if len(cache) < WINDOW_CACHE_SIZE:
+                        cache[window] = reversed_window
+                pieces.append(reversed_window)
+            if last:
+                pieces.append(plain[::-1])
+                break
+            pieces.append(plain[-2::-1])
+            window = plain[-1]
+        window += parts[index + 1]
+    pieces.reverse()
+    return "".join(pieces)
+
+def _iter_blocks_backwards(file, block_size):
+    """Yield (text, at_start) for a UTF-8 file, last block first.
+
+    Each block is decoded on whole-character boundaries: continuation bytes at
+    the start of a block are handed to the block before it. Undecodable bytes
+    are carried through unchanged via surrogateescape.
+    """
+    file.seek(0, os.SEEK_END)
+    position = file.tell()
+    carry = b""
+    while position > 0:
+        start = max(0, position - block_size)
+        file.seek(start)
+        data = file.read(position - start) + carry
+        position = start
+        carry = b""
+        if start > 0:
+            lead = 0
+            while lead < len(data) and lead < 4 and (data[lead] & 0xC0) == 0x80:
+                lead += 1
+            carry, data = data[:lead], data[lead:]
+        yield data.decode("utf-8", "surrogateescape"), start == 0
+
+def iter_reversed_characters(file, block_size=BLOCK_SIZE):
+    """Yield the characters of a binary UTF-8 file in reverse order, one block at a time.
+
+    Multibyte characters and grapheme clusters that straddle a block boundary
+    are carried over to the next block, so they come out intact.
+    """
+    carry = ""
+    for text, at_start in _iter_blocks_backwards(file, block_size):
+        text += carry
+        carry = ""
+        if not at_start and text:
+            # The first cluster may continue in the previous block; finish it
+            # there, unless it is implausibly long (only possible in degenerate
+            # input such as a long run of combining marks)
+            first = _attached_prefix_length(text)
+            if first <= CARRY_LIMIT:
+                carry, text = text[:first], text[first:]
+        if text:
+            yield reverse_graphemes(text)
+
+def iter_reversed_words(file, block_size=BLOCK_SIZE):
+    """Yield the words of a binary UTF-8 file in reverse order, one block at a time.
+
+    Like reverse_words, words are separated by any whitespace in the input and
+    joined by single spaces in the output.
+    """
+    carry = ""
+    first_piece = True
+    for text, at_start in _iter_blocks_backwards(file, block_size):
+        text += carry
+        carry = ""
+        if not at_start:
+            # A word touching the start of the block may continue in the previous block
+            partial = re.match(r"\S*", text).end()
+            carry, text = text[:partial], text[partial:]
+        words = text.split()
+        if words:
+            words.reverse()
+            yield ("" if first_piece else " ") + " ".join(words)
+            first_piece = False
+
+def iter_lines_backwards(file, block_size=BLOCK_SIZE):
+    """Yield the lines of a binary UTF-8 file last line first, like `tac`.
+
+    Lines keep their own line endings; a last line without one gets "\n" so
+    it does not run into the line that follows it in the output.
+    """
+    carry = ""
+    checked_end = False
+    for text, at_start in _iter_blocks_backwards(file, block_size):
+        if not checked_end and text:
+            checked_end = True
+            if not text.endswith("\n"):
+                text += "\n"
+        text += carry
+        carry = ""
+        if not at_start:
+            # The first line may begin in the previous block; finish it there
+            cut = text.find("\n") + 1
+            if not cut:
+                carry = text
+                continue
+            carry, text = text[:cut], text[cut:]
+        lines = text.split("\n")
+        lines.pop()
+        for line in reversed(lines):
+            yield line + "\n"
+
+def _split_line_ending(line):
+    """Split a line into its text and its line ending ("\r\n", "\n", "\r" or "")."""
+    if line.endswith("\r\n"):
+        return line[:-2], "\r\n"
+    if line.endswith(("\n", "\r")):
+        return line[:-1], line[-1]
+    return line, ""
+
+# Characters of a paragraph buffered at most before its sentences are reversed
+PARAGRAPH_LIMIT = BLOCK_SIZE
+
+# Whitespace between words, and whitespace that follows the end of a sentence
+# (optionally after a closing quote or bracket)
+WORD_BREAK = re.compile(r"(\s+)")
+SENTENCE_BREAK = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]\u201d\u2019]))(\s+)")
+
+def _reverse_tokens(text, separator):
+    """Reverse the pieces of `text` between `separator` matches.
+
+    The separators themselves stay where they are, as does any whitespace at
+    the start and end of the text.
+    """
+    lead = len(text) - len(text.lstrip())
+    trail = len(text.rstrip())
+    if lead >= trail:
+        return text
+    parts = separator.split(text[lead:trail])
+    parts[::2] = parts[::2][::-1]
+    return text[:lead] + "".join(parts) + text[trail:]
+
+def reverse_line_characters(lines):
+    """Reverse the characters within each line, keeping the line order."""
+    for line in lines:
+        body, ending = _split_line_ending(line)
+        yield reverse_graphemes(body) + ending
+
+def reverse_line_words(lines):
+    """Reverse the words within each line, keeping the original whitespace."""
+    for line in lines:
+        body, ending = _split_line_ending(line)
+        yield _reverse_tokens(body, WORD_BREAK) + ending
+
+def iter_paragraphs(lines, limit=PARAGRAPH_LIMIT):
+    """Group lines into paragraphs; each run of blank lines is yielded on its own.
+
+    A paragraph is yielded early, at a line end, once it holds more than
+    `limit` characters, so input without blank lines is not buffered whole.
+    """
+    paragraph = []
+    size = 0
+    for line in lines:
+        if line.strip():
+            paragraph.append(line)
+            size += len(line)
+            if size > limit:
+                yield "".join(paragraph)
+                paragraph = []
+                size = 0
+            continue
+        if paragraph:
+            yield "".join(paragraph)
+            paragraph = []
+            size = 0
+        yield line
+    if paragraph:
+        yield "".join(paragraph)
+
+def reverse_sentences(paragraphs):
+    """Reverse the order of the sentences within each paragraph."""
+    for paragraph in paragraphs:
+        yield _reverse_tokens(paragraph, SENTENCE_BREAK)
+
+def _text_lines(file):
+    """Read a binary UTF-8 file line by line, keeping line endings and undecodable bytes.
+
+    The wrapper is detached when reading stops, so the binary file (which may
+    be sys.stdin.buffer) stays open for its owner.
+    """
+    wrapper = io.TextIOWrapper(file, encoding="utf-8", errors="surrogateescape", newline="")
+    try:
+        yield from wrapper
+    finally:
+        if not wrapper.closed:
+            wrapper.detach()
+
+# Reversal modes: name -> function building the output pipeline from a binary file
+REVERSAL_MODES = {
+    "characters": iter_reversed_characters,
+    "words": iter_reversed_words,
+    "lines": iter_lines_backwards,
+    "line-characters": lambda file, block_size: reverse_line_characters(_text_lines(file)),
+    "line-words": lambda file, block_size: reverse_line_words(_text_lines(file)),
+    "sentences": lambda file, block_size: reverse_sentences(iter_paragraphs(_text_lines(file))),
+}
+
+def iter_reversed(file, mode, block_size=BLOCK_SIZE):
+    """Yield the reversed text of a binary UTF-8 file piece by piece.
+
+    Every mode is a generator pipeline that makes one pass over the input, so
+    the output can be written while the input is still being read.
+    """
+    if mode not in REVERSAL_MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Choose one of: {', '.join(REVERSAL_MODES)}")
+    return REVERSAL_MODES[mode](file, block_size)
+
+@timed()
+def reverse_text(text, mode):
+    """Apply any of the REVERSAL_MODES to a string in memory."""
+    source = io.BytesIO(text.encode("utf-8", "surrogateescape"))
+    return "".join(iter_reversed(source, mode))
+
+@timed()
+def reverse_file(source_path, target_path, mode, block_size=BLOCK_SIZE):
+    """Reverse a UTF-8 file into another file in the given mode, in constant memory.
+
+    Returns the number of characters written.
+    """
+    written = 0
+    with open(source_path, "rb") as source, open(target_path, "w", encoding="utf-8",
+                                                  errors="surrogateescape", newline="") as target:
+        for piece in iter_reversed(source, mode, block_size):
+            target.write(piece)
+            written += len(piece)
+    profile_count("characters_written", written)
+    return written
+
+@timed()
+def reverse_file_characters(source_path, target_path, block_size=BLOCK_SIZE):
+    """Reverse the characters of a UTF-8 file into another file, in constant memory.
+
+    Returns the number of bytes written.
+    """
+    written = 0
+    with open(source_path, "rb") as source, open(target_path, "wb") as target:
+        for piece in iter_reversed_characters(source, block_size):
+            data = piece.encode("utf-8", "surrogateescape")
+            target.write(data)
+            written += len(data)
+    return written
+
+@timed()
+def reverse_file_words(source_path, target_path, block_size=BLOCK_SIZE):
+    """Reverse the word order of a UTF-8 file into another file, in constant memory.
+
+    Returns the number of words written.
+    """
+    words = 0
+    with open(source_path, "rb") as source, open(target_path, "w", encoding="utf-8",
+                                                  errors="surrogateescape", newline="") as target:
+        for piece in iter_reversed_words(source, block_size):
+            target.write(piece)
+            # Pieces hold whole words only, so they can be counted one by one
+            words += len(piece.split())
+    return words
+
+# Modes that read their input from the end and therefore need a seekable file
+BACKWARD_MODES = ("characters", "words", "lines")
+
+@timed()
+def reverse_stream(source, target, mode, block_size=BLOCK_SIZE):
+    """Reverse a binary input stream into a binary output stream, e.g. stdin to stdout.
+
+    Line, per-line and sentence modes are pure filters that write as they
+    read. Modes that start from the end of the input first spool a pipe to a
+    temporary file. Returns the number of characters written.
+    """
+    spooled = None
+    if mode in BACKWARD_MODES and not source.seekable():
+        spooled = tempfile.TemporaryFile()
+        shutil.copyfileobj(source, spooled, BLOCK_SIZE)
+        source = spooled
+    written = 0
+    try:
+        for piece in iter_reversed(source, mode, block_size):
+            target.write(piece.encode("utf-8", "surrogateescape"))
+            written += len(piece)
+        target.flush()
+        profile_count("characters_written", written)
+    finally:
+        if spooled is not None:
+            spooled.close()
+    return written
+
+def find_files(input_dir, pattern="*"):
+    """Paths (relative to input_dir) of every file in the tree matching `pattern`, sorted."""
+    found = []
+    for directory, subdirectories, files in os.walk(input_dir):
+        subdirectories.sort()
+        for name in sorted(files):
+            if fnmatch.fnmatch(name, pattern):
+                found.append(os.path.relpath(os.path.join(directory, name), input_dir))
+    return found
+
+@timed()
+def _reverse_task(task):
+    """Worker entry point for reverse_directory.
+
+    Returns (relative_path, result, error): result is the number of
+    characters written, or the reversed text itself when there is no output
+    directory; error is None on success.
+    """
+    input_dir, output_dir, relative_path, mode = task
+    source_path = os.path.join(input_dir, relative_path)
+    try:
+        if output_dir is None:
+            with open(source_path, "rb") as source:
+                return relative_path, "".join(iter_reversed(source, mode)), None
+        target_path = os.path.join(output_dir, relative_path)
+        os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+        return relative_path, reverse_file(source_path, target_path, mode), None
+    except (OSError, ValueError) as e:
+        return relative_path, None, str(e)
+
+def reverse_directory(input_dir, output_dir, mode, pattern="*", workers=None):
+    """Reverse every matching file in a directory tree across a process pool.
+
+    With an output directory the tree is mirrored there. Without one, each
+    worker returns its file's reversed text. Either way, results are yielded
+    as (relative_path, result, error) in sorted path order, however the
+    workers finish.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [(input_dir, output_dir, path, mode) for path in find_files(input_dir, pattern)]
+    if workers == 1 or len(tasks) < 2:
+        for task in tasks:
+            yield _reverse_task(task)
+        return
+    # Several files per message keeps the pool busy when files are small
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap(_reverse_task, tasks, chunksize)
+
+@timed()
 def reverse_characters(text):
-    """Reverse the characters in a string."""
+    """Reverse the characters in a string, keeping grapheme clusters intact."""
     if not text:
         return "Error: Empty string provided."
-    return text[::-1]
+    return reverse_graphemes(text)
 
+@timed()
 def reverse_words(text):
     """Reverse the order of words while maintaining their original spelling."""
     if not text:
@@ -13,10 +499,11 @@ def reverse_words(text):
         return "Error: No words found."
     return " ".join(words[::-1])
 
-def save_to_file(text):
-    """Save the reversed text to a file."""
+def save_to_file(text, filename=None):
+    """Save the reversed text to a file, asking for the file name if none is given."""
     try:
-        filename = input("Enter filename to save (e.g., reversed.txt): ")
+        if filename is None:
+            filename = input("Enter filename to save (e.g., reversed.txt): ")
         with open(filename, 'w') as file:
             file.write(text)
         return f"Text successfully saved to {filename}"
@@ -29,17 +516,18 @@ def text_reverser_cli():
     print("Welcome to Text Reverser".center(50))
     print("="*50)
     
+    last_result = ""
+    
     while True:
         print("\nMenu Options:")
         print("1. Reverse Character Order")
         print("2. Reverse Word Order")
         print("3. Save Last Result to File")
-        print("4. Exit Program")
-        
-        last_result = ""
+        print("4. Reverse a File")
+        print("5. Exit Program")
         
         try:
-            choice = input("\nEnter your choice (1-4): ")
+            choice = input("\nEnter your choice (1-5): ")
             
             if choice == '1':
                 text = input("\nEnter text to reverse characters: ")
@@ -67,16 +555,118 @@ def text_reverser_cli():
                     print(result)
                     
             elif choice == '4':
+                source = input("\nEnter the file to reverse: ").strip()
+                target = input("Enter the output file: ").strip()
+                mode = input(f"Mode ({', '.join(REVERSAL_MODES)}): ").strip().lower()
+                if not source or not target or mode not in REVERSAL_MODES:
+                    print("Warning: Please enter both file names and one of the listed modes.")
+                    continue
+                written = reverse_file(source, target, mode)
+                print(f"\nWrote {written} characters to {target}")
+                
+            elif choice == '5':
                 print("\nThank you for using Text Reverser. Goodbye!")
                 break
                 
             else:
-                print("Invalid choice. Please enter a number between 1 and 4.")
+                print("Invalid choice. Please enter a number between 1 and 5.")
                 
         except Exception as e:
             print(f"An error occurred: {str(e)}")
             print("Please try again.")
 
+# Characters of a result shown in the output box at once, characters the
+# worker gathers into one chunk of the result, and how often the GUI checks
+# on a running job
+VIEW_CHARS = 20000
+RESULT_CHUNK = 1 << 20
+POLL_INTERVAL_MS = 50
+
+class ReversalJob:
+    """One reversal running on a worker thread.
+
+    The result is kept as a list of large chunks, so the GUI can show any
+    window of it (`slice`) and save it (`write_to`) without ever joining it
+    into one string or reading it back from a widget. The GUI polls `done`,
+    `progress` and `error` from the Tk main thread; `cancel` stops the worker
+    at the next piece.
+    """
+
+    def __init__(self, text, mode):
+        self.text = text
+        self.mode = mode
+        self.chunks = []
+        self.offsets = [0]  # offsets[i] is where chunk i starts; the last entry is the length
+        self.done = False
+        self.error = None
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="text-reverser", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    @property
+    def length(self):
+        return self.offsets[-1]
+
+    @property
+    def progress(self):
+        """Fraction of the work done (estimated from the output length)."""
+        if self.done:
+            return 1.0
+        return min(1.0, self.length / len(self.text)) if self.text else 0.0
+
+    def _add(self, chunk):
+        # Append the chunk before its offset, so a reader never sees an offset without its chunk
+        self.chunks.append(chunk)
+        self.offsets.append(self.offsets[-1] + len(chunk))
+
+    @timed()
+    def _run(self):
+        try:
+            source = io.BytesIO(self.text.encode("utf-8", "surrogateescape"))
+            buffer = []
+            buffered = 0
+            for piece in iter_reversed(source, self.mode):
+                if self.cancelled.is_set():
+                    return
+                buffer.append(piece)
+                buffered += len(piece)
+                if buffered >= RESULT_CHUNK:
+                    self._add("".join(buffer))
+                    buffer = []
+                    buffered = 0
+            if buffer:
+                self._add("".join(buffer))
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def slice(self, start, stop):
+        """Characters start..stop of the result produced so far."""
+        stop = min(stop, self.length)
+        pieces = []
+        index = bisect.bisect_right(self.offsets, start) - 1
+        while start < stop:
+            chunk_start = self.offsets[index]
+            chunk = self.chunks[index]
+            piece = chunk[start - chunk_start:stop - chunk_start]
+            pieces.append(piece)
+            start += len(piece)
+            index += 1
+        return "".join(pieces)
+
+    def write_to(self, path):
+        """Stream the result into a UTF-8 file, one chunk at a time."""
+        with open(path, "w", encoding="utf-8", errors="surrogateescape", newline="") as file:
+            for chunk in self.chunks:
+                file.write(chunk)
+
 # GUI implementation using tkinter
 def create_gui():
     """Create a GUI for the Text Reverser program using tkinter."""
@@ -84,45 +674,165 @@ def create_gui():
         import tkinter as tk
         from tkinter import messagebox, filedialog
         
-        def reverse_chars_action():
+        job = None        # the running or last finished reversal
+        result = None     # the last completed reversal, shown in the output box
+        view_offset = 0   # first character of `result` shown in the output box
+        shown_length = 0  # characters of `result` currently in the output box
+        
+        def set_busy(busy):
+            state = tk.DISABLED if busy else tk.NORMAL
+            for button in (reverse_chars_btn, reverse_words_btn, save_btn):
+                button.config(state=state)
+            cancel_btn.config(state=tk.NORMAL if busy else tk.DISABLED)
+        
+        def start_reversal(mode):
+            nonlocal job
             text = input_text.get("1.0", tk.END).strip()
             if not text:
                 messagebox.showwarning("Warning", "Please enter some text.")
                 return
-            result = reverse_characters(text)
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, result)
+            job = ReversalJob(text, mode).start()
+            set_busy(True)
+            poll_job(job)
+        
+        def reverse_chars_action():
+            start_reversal("characters")
         
         def reverse_words_action():
-            text = input_text.get("1.0", tk.END).strip()
-            if not text:
-                messagebox.showwarning("Warning", "Please enter some text.")
+            start_reversal("words")
+        
+        def cancel_action():
+            if job is not None and not job.done:
+                job.cancel()
+                cancel_btn.config(state=tk.DISABLED)
+                status_label.config(text="Cancelling...")
+        
+        # Tk must only be touched from the main thread, so poll the worker;
+        # the status only changes once the worker has really finished
+        def poll_job(current):
+            nonlocal result
+            if not current.done:
+                if not current.cancelled.is_set():
+                    status_label.config(text=f"Reversing... {current.progress:.0%}")
+                root.after(POLL_INTERVAL_MS, poll_job, current)
                 return
-            result = reverse_words(text)
+            set_busy(False)
+            if current.cancelled.is_set():
+                status_label.config(text="Cancelled.")
+                return
+            if current.error is not None:
+                status_label.config(text="")
+                messagebox.showerror("Error", f"Failed to reverse text: {current.error}")
+                return
+            result = current
+            status_label.config(text=f"Done: {result.length:,} characters.")
+            show_view(0)
+        
+        # Only a window of VIEW_CHARS characters is ever inserted into the output box.
+        # `top` is the character of `result` to scroll to the top of the box.
+        def show_view(offset, top=None):
+            nonlocal view_offset, shown_length
+            if result is None:
+                return
+            offset = max(0, min(offset, result.length - VIEW_CHARS))
+            view_offset = offset
+            shown = result.slice(offset, offset + VIEW_CHARS)
+            shown_length = len(shown)
             output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, result)
+            output_text.insert(tk.END, shown)
+            if top is not None:
+                output_text.yview(f"1.0 + {max(0, top - offset)} chars")
+            sync_scrollbar(*output_text.yview())
+        
+        # The output box reports its own scrolling here, as a fraction of the
+        # window; the scrollbar shows it as a fraction of the whole result
+        def sync_scrollbar(first, last):
+            if result is None or not result.length:
+                output_scrollbar.set(0, 1)
+                return
+            output_scrollbar.set((view_offset + float(first) * shown_length) / result.length,
+                                 (view_offset + float(last) * shown_length) / result.length)
+        
+        def top_character():
+            """Offset in `result` of the first character visible in the output box."""
+            counted = output_text.count("1.0", "@0,0", "chars")
+            if isinstance(counted, tuple):
+                counted = counted[0]
+            return view_offset + (counted or 0)
+        
+        # Every way of scrolling the output (scrollbar, wheel, keys) comes through here
+        def scroll_output(action, amount, unit=None):
+            if result is None or not result.length:
+                return
+            if action == "moveto":
+                target = int(float(amount) * result.length)
+                show_view(target - VIEW_CHARS // 2, target)
+                return
+            amount = int(amount)
+            first, last = output_text.yview()
+            # At the edge of the window, move the window before scrolling inside it
+            at_bottom = amount > 0 and float(last) >= 1.0 and view_offset + shown_length < result.length
+            at_top = amount < 0 and float(first) <= 0.0 and view_offset > 0
+            if at_bottom or at_top:
+                top = top_character()
+                show_view(top - VIEW_CHARS // 2, top)
+            output_text.yview_scroll(amount, unit or "units")
+        
+        def wheel_output(event):
+            up = event.num == 4 or event.delta > 0
+            scroll_output("scroll", -3 if up else 3, "units")
+            return "break"
+        
+        def key_output(event):
+            if event.keysym in ("Prior", "Next"):
+                scroll_output("scroll", -1 if event.keysym == "Prior" else 1, "pages")
+            elif event.keysym in ("Up", "Down"):
+                scroll_output("scroll", -1 if event.keysym == "Up" else 1, "units")
+            else:
+                scroll_output("moveto", 0.0 if event.keysym == "Home" else 1.0)
+            return "break"
         
         def save_action():
-            result = output_text.get("1.0", tk.END).strip()
-            if not result:
+            if result is None or not result.length:
                 messagebox.showwarning("Warning", "No reversed text to save.")
                 return
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".txt",
                 filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
             )
-            if file_path:
+            if not file_path:
+                return
+            saving = result
+            finished = []
+            
+            def worker():
                 try:
-                    with open(file_path, 'w') as file:
-                        file.write(result)
-                    messagebox.showinfo("Success", f"Text saved to {file_path}")
+                    saving.write_to(file_path)
+                    finished.append(None)
                 except Exception as e:
-                    messagebox.showerror("Error", f"Failed to save file: {str(e)}")
+                    finished.append(e)
+            
+            def check_done():
+                if not finished:
+                    root.after(POLL_INTERVAL_MS, check_done)
+                    return
+                set_busy(False)
+                status_label.config(text="")
+                if finished[0] is None:
+                    messagebox.showinfo("Success", f"Text saved to {file_path}")
+                else:
+                    messagebox.showerror("Error", f"Failed to save file: {str(finished[0])}")
+            
+            threading.Thread(target=worker, name="text-reverser-save", daemon=True).start()
+            set_busy(True)
+            cancel_btn.config(state=tk.DISABLED)
+            status_label.config(text=f"Saving to {file_path}...")
+            check_done()
         
         # Create the main window
         root = tk.Tk()
         root.title("Text Reverser")
-        root.geometry("600x400")
+        root.geometry("600x450")
         
         # Create and place widgets
         tk.Label(root, text="Enter text to reverse:", font=("Arial", 12)).pack(pady=5)
@@ -143,10 +853,25 @@ def create_gui():
         save_btn = tk.Button(button_frame, text="Save to File", command=save_action, width=15)
         save_btn.grid(row=0, column=2, padx=5)
         
+        cancel_btn = tk.Button(button_frame, text="Cancel", command=cancel_action, width=8, state=tk.DISABLED)
+        cancel_btn.grid(row=0, column=3, padx=5)
+        
+        status_label = tk.Label(root, text="", font=("Arial", 10, "italic"))
+        status_label.pack()
+        
         tk.Label(root, text="Reversed text:", font=("Arial", 12)).pack(pady=5)
         
-        output_text = tk.Text(root, height=5, width=60)
-        output_text.pack(pady=5)
+        # The scrollbar moves through the whole result, not just the text in the box
+        output_frame = tk.Frame(root)
+        output_frame.pack(pady=5)
+        output_text = tk.Text(output_frame, height=5, width=60, yscrollcommand=sync_scrollbar)
+        output_text.pack(side=tk.LEFT)
+        output_scrollbar = tk.Scrollbar(output_frame, command=scroll_output)
+        output_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            output_text.bind(sequence, wheel_output)
+        for sequence in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Control-Home>", "<Control-End>"):
+            output_text.bind(sequence, key_output)
         
         # Start the GUI
         root.mainloop()
@@ -155,11 +880,82 @@ def create_gui():
         print("Tkinter module not found. Running command-line version instead.")
         text_reverser_cli()
 
-if __name__ == "__main__":
+def run_interactive():
+    """Start the GUI, falling back to the interactive menu."""
     try:
         # Try to use GUI version first
         create_gui()
     except Exception as e:
         print(f"Error starting GUI: {str(e)}")
         print("Falling back to command line interface.")
-        text_reverser_cli()
\ No newline at end of file
+        text_reverser_cli()
+
+def build_parser():
+    """Build the argument parser for the non-interactive command line."""
+    parser = argparse.ArgumentParser(
+        description="Reverse text. Run without arguments for the GUI.")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="file or directory to reverse, '-' for stdin (default: -)")
+    parser.add_argument("-m", "--mode", choices=list(REVERSAL_MODES), default="characters",
+                        help="what to reverse (default: characters)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file, or output directory for a directory input; '-' for stdout (default: -)")
+    parser.add_argument("-p", "--pattern", default="*", help="file name pattern for directory input (default: *)")
+    parser.add_argument("-w", "--workers", type=int, help="processes for directory input (default: all cores)")
+    return parser
+
+def main(argv=None):
+    """Entry point: GUI or menu without arguments, streaming/batch CLI otherwise.
+
+    Reading from stdin needs at least one argument (e.g. "-"), so a launch
+    without a terminal (desktop shortcut, IDE, pythonw) still opens the GUI.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        run_interactive()
+        return 0
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.input == "-" and sys.stdin is None:
+        parser.error("there is no standard input to read from")
+    try:
+        if os.path.isdir(args.input):
+            output_dir = None if args.output == "-" else args.output
+            failures = 0
+            with span("reverse_directory"):
+                for path, result, error in reverse_directory(args.input, output_dir, args.mode,
+                                                             args.pattern, args.workers):
+                    if error is not None:
+                        failures += 1
+                        print(f"Error: {path}: {error}", file=sys.stderr)
+                    elif output_dir is None:
+                        if not result.endswith("\n"):
+                            result += "\n"
+                        sys.stdout.buffer.write(result.encode("utf-8", "surrogateescape"))
+                    else:
+                        print(f"{path}: {result} characters")
+            sys.stdout.flush()
+            return 1 if failures else 0
+
+        source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+        try:
+            target = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+            try:
+                reverse_stream(source, target, args.mode)
+            finally:
+                if target is not sys.stdout.buffer:
+                    target.close()
+        finally:
+            if source is not sys.stdin.buffer:
+                source.close()
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); that is not an error
+        sys.stderr.close()
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
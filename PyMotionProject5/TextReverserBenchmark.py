@@ -0,0 +1,266 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import unicodedata
+
+from TextReverser import (reverse_characters, reverse_words, reverse_file, REVERSAL_MODES,
+                          _grapheme_tables)
+
+# Characters used to build each kind of sample text
+ASCII_WORDS = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "and", "runs", "away"]
+ACCENTED_WORDS = ["café", "naïve", "résumé", "jalapeño", "façade", "été"]
+# The same words with their accents as separate combining marks
+DECOMPOSED_WORDS = [unicodedata.normalize("NFD", word) for word in ACCENTED_WORDS]
+CJK_CHARS = "的一是不了人我在有他这中大来上国个到说们为子和你地出道也时年"
+EMOJI = ["👍", "👍🏽", "👨‍👩‍👧", "🇫🇷", "❤️", "1️⃣"]
+
+SCRIPTS = ("ascii", "latin-1", "mostly-ascii", "cjk", "emoji")
+
+# In-memory functions; plain slicing is the reference the others are compared with
+IN_MEMORY = {
+    "slicing": lambda text: text[::-1],
+    "reverse_characters": reverse_characters,
+    "reverse_words": reverse_words,
+}
+
+# Larger inputs are built by repeating a sample of this many characters
+SAMPLE_CHARS = 1 << 20
+
+DEFAULT_SIZES = "1K,1M,16M"
+DEFAULT_MAX_IN_MEMORY = "256M"
+DEFAULT_THRESHOLD = 0.10
+
+
+def parse_size(value):
+    """Parse sizes such as 1024, 64K, 16M or 2G (powers of 1024) into bytes."""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    value = value.strip().upper().rstrip("B")
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def format_size(size):
+    """Short label for a byte count, e.g. 1M for 1048576."""
+    for unit, scale in (("G", 1 << 30), ("M", 1 << 20), ("K", 1 << 10)):
+        if size >= scale:
+            return f"{size // scale}{unit}" if size % scale == 0 else f"{size / scale:.1f}{unit}"
+    return str(size)
+
+
+def make_text(kind, size, seed=0):
+    """Build roughly `size` characters of sample text of the given kind.
+
+    Words are separated by spaces, with sentence ends, line breaks and the
+    odd blank line, so that the line and sentence modes have work to do.
+    """
+    rng = random.Random(seed)
+    pieces = []
+    length = 0
+    while length < size:
+        if kind == "ascii":
+            piece = rng.choice(ASCII_WORDS)
+        elif kind == "latin-1":
+            piece = rng.choice(ACCENTED_WORDS if rng.random() < 0.3 else ASCII_WORDS)
+        elif kind == "mostly-ascii":
+            # About one word in a hundred has an accent or is an emoji
+            roll = rng.random()
+            piece = rng.choice(ACCENTED_WORDS if roll < 0.004 else DECOMPOSED_WORDS if roll < 0.007
+                               else EMOJI if roll < 0.01 else ASCII_WORDS)
+        elif kind == "cjk":
+            piece = "".join(rng.choice(CJK_CHARS) for _ in range(rng.randint(2, 8)))
+        else:
+            piece = rng.choice(EMOJI) + rng.choice(ASCII_WORDS)
+        roll = rng.random()
+        separator = "\n\n" if roll < 0.005 else "\n" if roll < 0.08 else ". " if roll < 0.15 else " "
+        pieces.append(piece + separator)
+        length += len(piece) + len(separator)
+    return "".join(pieces)
+
+
+def make_input(kind, size):
+    """Text of the given kind whose UTF-8 encoding is about `size` bytes."""
+    sample = make_text(kind, min(size, SAMPLE_CHARS))
+    encoded = len(sample.encode("utf-8"))
+    repeats = -(-size // encoded)
+    text = sample * repeats
+    return text[:max(1, len(text) * size // (encoded * repeats))]
+
+
+def write_input(kind, size, path):
+    """Write about `size` bytes of UTF-8 text to `path` without holding it all in memory."""
+    sample = make_text(kind, SAMPLE_CHARS).encode("utf-8")
+    written = 0
+    with open(path, "wb") as file:
+        while written + len(sample) <= size:
+            file.write(sample)
+            written += len(sample)
+        if written < size:
+            tail = make_input(kind, size - written).encode("utf-8")
+            file.write(tail)
+            written += len(tail)
+    return written
+
+
+def measure(function, repeat):
+    """Best time of `repeat` calls of function(), in seconds.
+
+    Never less than the timer's resolution, so throughput is always finite.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return max(best, time.get_clock_info("perf_counter").resolution)
+
+
+def peak_memory(function):
+    """Peak Python memory allocated while function() runs, in bytes.
+
+    tracemalloc slows allocation down, so this is a separate run from the timed ones.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def result_key(result):
+    """Identifies the same measurement across runs (by requested input size)."""
+    return f"{result['variant']}:{result['function']}:{result['script']}:{format_size(result['size'])}"
+
+
+def run_benchmarks(sizes, scripts, max_in_memory, repeat, track_memory, workdir, modes=None):
+    """Measure every in-memory function and streaming mode; return a list of result dicts.
+
+    Inputs up to `max_in_memory` bytes are also reversed as strings; every
+    size is written to a file in `workdir` and reversed file to file.
+    """
+    modes = modes or list(REVERSAL_MODES)
+    results = []
+
+    def record(variant, function, script, size, actual, seconds, peak):
+        result = {
+            "variant": variant, "function": function, "script": script, "size": size, "bytes": actual,
+            "seconds": seconds, "mb_per_s": actual / seconds / 1e6,
+            "peak_bytes": peak,
+        }
+        results.append(result)
+        peak_text = f"{peak / 1e6:>10,.1f} MB" if peak is not None else f"{'-':>13}"
+        print(f"{variant:<7} {function:<19} {script:<13} {format_size(size):>6} | "
+              f"{result['mb_per_s']:>10,.1f} MB/s | {peak_text}", flush=True)
+
+    for size in sizes:
+        # Big inputs take long enough that a single run is a stable measurement
+        runs = repeat if size <= 64 << 20 else 1
+        for script in scripts:
+            if size <= max_in_memory:
+                text = make_input(script, size)
+                actual = len(text.encode("utf-8"))
+                for name, function in IN_MEMORY.items():
+                    seconds = measure(lambda: function(text), runs)
+                    peak = peak_memory(lambda: function(text)) if track_memory else None
+                    record("memory", name, script, size, actual, seconds, peak)
+                del text
+
+            source = os.path.join(workdir, f"input-{script}-{size}.txt")
+            target = os.path.join(workdir, f"output-{script}-{size}.txt")
+            actual = write_input(script, size, source)
+            try:
+                for mode in modes:
+                    seconds = measure(lambda: reverse_file(source, target, mode), runs)
+                    peak = peak_memory(lambda: reverse_file(source, target, mode)) if track_memory else None
+                    record("stream", mode, script, size, actual, seconds, peak)
+            finally:
+                for path in (source, target):
+                    if os.path.exists(path):
+                        os.remove(path)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Results whose throughput fell more than `threshold` below the baseline's.
+
+    Returns (result, baseline MB/s) pairs.
+    """
+    previous = {result_key(result): result["mb_per_s"] for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(result_key(result))
+        if before and result["mb_per_s"] < before * (1 - threshold):
+            regressions.append((result, before))
+    return regressions
+
+
+def main():
+    """Run the benchmark suite, write JSON results and check them against a baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark TextReverser across input sizes and scripts.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma-separated input sizes in bytes, e.g. 1K,1M,2G (default: {DEFAULT_SIZES})")
+    parser.add_argument("--scripts", default=",".join(SCRIPTS),
+                        help=f"comma-separated kinds of text (default: {','.join(SCRIPTS)})")
+    parser.add_argument("--modes", help="comma-separated streaming modes (default: all)")
+    parser.add_argument("--max-in-memory", default=DEFAULT_MAX_IN_MEMORY,
+                        help=f"largest size also benchmarked in memory (default: {DEFAULT_MAX_IN_MEMORY})")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, best is kept (default: 3)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory runs")
+    parser.add_argument("--workdir", help="directory for the generated input files (default: system temp)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed throughput drop against the baseline (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    scripts = args.scripts.split(",")
+    for script in scripts:
+        if script not in SCRIPTS:
+            parser.error(f"unknown script '{script}'")
+    modes = args.modes.split(",") if args.modes else None
+    for mode in modes or ():
+        if mode not in REVERSAL_MODES:
+            parser.error(f"unknown mode '{mode}'")
+
+    start = time.perf_counter()
+    _grapheme_tables()
+    print(f"Grapheme tables built in {time.perf_counter() - start:.3f}s (once per process)")
+    print(f"{'Variant':<7} {'Function':<19} {'Text':<13} {'Size':>6} | {'Throughput':>15} | {'Peak memory':>13}")
+    print("-" * 86)
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        results = run_benchmarks(sizes, scripts, parse_size(args.max_in_memory), args.repeat,
+                                 not args.no_memory, workdir, modes)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "threshold": args.threshold,
+                "results": results,
+            }, file, indent=4, allow_nan=False)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for result, before in regressions:
+                print(f"  {result_key(result)}: {before:,.1f} -> {result['mb_per_s']:,.1f} MB/s")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())